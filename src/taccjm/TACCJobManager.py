@@ -14,8 +14,12 @@ import json                     # For saving and loading job configs to disk
 import time                     # Time functions
 import logging                  # Used to setup the Paramiko log file
 import stat                     # For reading file stat codes
-from datetime import datetime   # Date time functionality
+import shutil                   # For copying file streams
+import shlex                    # For quoting paths in remote commands
+import copy                     # For returning copies of cached configs
 from fnmatch import fnmatch     # For unix-style filename pattern matching
+from threading import local     # Per-thread SFTP sessions
+from concurrent.futures import ThreadPoolExecutor  # Parallel file transfers
 from taccjm.utils import *      # TACCJM Util functions for config files/dicts
 from taccjm.constants import *  # For application configs
 from typing import Tuple, List  # Type hints
@@ -58,6 +62,7 @@ class TACCJobManager():
 
     Methods
     -------
+    close
     showq
     get_allocations
     list_files
@@ -97,6 +102,11 @@ class TACCJobManager():
     PSW_PROMPT = "Password:"
     MFA_PROMPT ="TACC Token Code:"
     SCRATCH_DIR = "$SCRATCH"
+    MAX_TRANSFER_WORKERS = 8
+    TRANSFER_CHUNK_SIZE = 2**17
+    APPS_CACHE_TTL = 30
+    COMPRESSED_EXTS = ('.gz', '.tgz', '.bz2', '.xz', '.zip', '.zst', '.7z',
+                       '.jpg', '.jpeg', '.png', '.gif', '.mp3', '.mp4')
 
 
     def __init__(self, system, user=None,
@@ -135,34 +145,48 @@ class TACCJobManager():
             raise ValueError(msg)
 
         # Connect to system
-        logger.info(f"Connecting {user} to system {system}...")
+        logger.info("Connecting %s to system %s...", user, system)
         self.system= f"{system}.tacc.utexas.edu"
         self._client = SSHClient2FA(user_prompt=self.USER_PROMPT,
                 psw_prompt=self.PSW_PROMPT,
                 mfa_prompt=self.MFA_PROMPT)
         self.user = self._client.connect(self.system,
                 uid=user, pswd=psw, mfa_pswd=mfa)
-        logger.info(f"Succesfuly connected to {system}")
+        logger.info("Succesfuly connected to %s", system)
 
-        # Get taccjm working directory, relative to users scratch directory
-        self.SCRATCH_DIR = scratch_dir = self._execute_command(
-                f"echo {self.SCRATCH_DIR}").strip()
-        logger.info("Resolved scratch path  to ${self.SCRATCH_DIR} for user {self.user}")
-        taccjm_dir = posixpath.join(self.SCRATCH_DIR, working_dir)
+        # SFTP sessions, opened on first use and reused across calls. Each
+        # thread gets its own session (channel) on the shared connection.
+        self._local = local()
+
+        # Deployed apps list and app configs, cached for APPS_CACHE_TTL secs
+        self._apps_cache = (0, None)
+        self._app_configs = {}
 
-        # Initialze jobs, apps, scripts, and trash dirs
+        # In one round trip: resolve users scratch directory, create jobs,
+        # apps, scripts, and trash dirs relative to it, and get python path
         logger.info("Creating if jobs, apps, scripts, and trash dirs")
-        for d in zip(['jobs_dir', 'apps_dir', 'scripts_dir', 'trash_dir'],
-                      ['jobs', 'apps', 'scripts', 'trash']):
-            setattr(self, d[0], posixpath.join(taccjm_dir,d[1]))
-            logger.info(f"Initializing directory {getattr(self, d[0])}")
-            self._mkdir(getattr(self, d[0]), parents=True)
+        dirs = ['jobs', 'apps', 'scripts', 'trash']
+        taccjm_dir = posixpath.join(self.SCRATCH_DIR, working_dir)
+        cmnd = f"echo {self.SCRATCH_DIR} && mkdir -p "
+        cmnd += ' '.join([posixpath.join(taccjm_dir, d) for d in dirs])
+        cmnd += " && which python"
+        try:
+            ret = self._execute_command(cmnd).split('\n')
+        except TJMCommandError as tjm_error:
+            tjm_error.message = f"__init__ - Unable to initialize {taccjm_dir}"
+            logger.error(tjm_error.message)
+            raise tjm_error
+        self.SCRATCH_DIR, self.python_path = ret[0], ret[1]
+        logger.info("Resolved scratch path to %s", self.SCRATCH_DIR)
 
-        # Get python path and home dir
-        self.python_path = self._execute_command('which python')
+        # Set jobs, apps, scripts, and trash dirs
+        taccjm_dir = posixpath.join(self.SCRATCH_DIR, working_dir)
+        for d in dirs:
+            setattr(self, f"{d}_dir", posixpath.join(taccjm_dir, d))
+            logger.info("Initialized directory %s", getattr(self, f"{d}_dir"))
 
 
-    def _execute_command(self, cmnd, wait=True) -> None:
+    def _execute_command(self, cmnd, wait=True, stdin=None) -> None:
         """
         Executes a shell command through ssh on a TACC resource.
 
@@ -171,6 +195,10 @@ class TACCJobManager():
         cmnd : str
             Command to execute. Be careful! rm commands and such will delete
             things permenantly!
+        stdin : callable, optional
+            Function to stream data to the command's standard input. Called
+            with a writable file-like object, after which the command's input
+            is closed.
 
         Returns
         -------
@@ -193,13 +221,38 @@ class TACCJobManager():
             raise ssh_error
 
         channel.exec_command(cmnd)
+        if stdin is not None:
+            try:
+                # Unbuffered -> writes go straight to the channel as memoryview
+                # slices, with no copies through an intermediate write buffer
+                with channel.makefile('wb', 0) as fp:
+                    stdin(fp)
+            except OSError as e:
+                # Remote command exited before reading all its input. Fall
+                # through to report its return code and output instead.
+                if not channel.exit_status_ready():
+                    channel.close()
+                    raise e
+            except BaseException:
+                # Don't leave remote command blocked waiting on its input
+                channel.close()
+                raise
+            channel.shutdown_write()
+
+        # Read full outputs until EOF, then decode once. stderr is drained in a
+        # helper thread while stdout is read, since data left unread in either
+        # stream holds up the channel window and stalls the remote command.
+        # Note non-empty stderr alone is not an error, only a non-zero rc is.
+        with channel.makefile('rb') as fo, channel.makefile_stderr('rb') as fe:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                f_err = pool.submit(fe.read)
+                out = fo.read().decode('utf-8', errors='replace')
+            err = f_err.result().decode('utf-8', errors='replace')
         rc = channel.recv_exit_status()
-        out = channel.recv(1000000).decode('utf-8')
-        err = channel.recv_stderr(1000000).decode('utf-8')
 
         if rc!=0:
             # Build base TJMCommand Error, only place this should be done
-            t = TJMCommandError(self.system, self.user, cmnd, rc, out, err)
+            t = TJMCommandError(self.system, self.user, cmnd, rc, err, out)
 
             # Only log the actual TJMCommandError object once, here
             logger.error(t.__str__())
@@ -209,6 +262,103 @@ class TACCJobManager():
         return out
 
 
+    def _execute_commands(self, cmnds:List[str]) -> List[Tuple[str, int]]:
+        """
+        Executes several shell commands through a single ssh exec on a TACC
+        resource, saving a round trip per command. Each command runs in its
+        own subshell, in order, regardless of whether previous ones failed.
+
+        Parameters
+        ----------
+        cmnds : list of str
+            Commands to execute.
+
+        Returns
+        -------
+        results : list of tuple of (str, int)
+            stdout and return code of each command, in the order given.
+
+        Raises
+        ------
+        TJMCommandError
+            If the batch itself fails, or the output of every command could
+            not be told apart.
+        """
+        # Marker line, with return code, printed after each command's output.
+        # Commands end in a newline, so a trailing comment can't swallow it.
+        mark = "__TJM_MARK__"
+        batch = "\n".join([f"( {c}\n) ; printf '\\n{mark} %d\\n' $?"
+                            for c in cmnds])
+        out = self._execute_command(batch)
+        parts = re.split(rf"\n{mark} (\d+)\n", out)
+        results = [(o, int(rc)) for o, rc in zip(parts[0::2], parts[1::2])]
+
+        if len(results)!=len(cmnds):
+            msg = f"_execute_commands - Expected {len(cmnds)} results, "
+            msg += f"got {len(results)}"
+            t = TJMCommandError(self.system, self.user, batch, 0, '', out,
+                                message=msg)
+            logger.error(t.__str__())
+            raise t
+
+        return results
+
+
+    def _open_sftp(self):
+        """
+        Get the SFTP session for this connection. A single session is kept
+        open and reused across calls, since opening an SFTP subsystem costs a
+        few round trips to the TACC system. The session is re-opened if it
+        has been closed (e.g. the channel dropped). Sessions are per-thread,
+        so concurrent transfers each get their own SFTP channel.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        sftp : paramiko.SFTPClient
+            Open SFTP client on the ssh connection to the TACC system.
+        """
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is None or sftp.get_channel().closed:
+            sftp = self._local.sftp = self._client.open_sftp()
+
+        return sftp
+
+
+    def _close_sftp(self) -> None:
+        """
+        Close the current thread's SFTP session, if one is open.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None
+        """
+        sftp = getattr(self._local, 'sftp', None)
+        if sftp is not None:
+            sftp.close()
+            self._local.sftp = None
+
+
+    def close(self) -> None:
+        """
+        Close SFTP session and ssh connection to TACC system.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None
+        """
+        self._close_sftp()
+        self._client.close()
+
+
     def _mkdir(self, path, parents=False) -> None:
         """
         Creates directory on remote system.
@@ -224,7 +374,8 @@ class TACCJobManager():
             An SFTP error code int like SFTP_OK (0).
 
         """
-        cmnd = f"mkdir {path}" if not parents else f"mkdir -p {path}"
+        cmnd = f"mkdir {shlex.quote(path)}" if not parents \
+                else f"mkdir -p {shlex.quote(path)}"
 
         try:
             ret = self._execute_command(cmnd)
@@ -234,6 +385,58 @@ class TACCJobManager():
             raise tjm_error
 
 
+    def _put_file(self, local:str, remote:str) -> None:
+        """
+        Sends a single file to remote system over SFTP. Writes are pipelined
+        in TRANSFER_CHUNK_SIZE requests, larger than paramiko's default 32 KiB
+        request size, so fewer requests are needed for large files.
+
+        Parameters
+        ----------
+        local : str
+            Path to local file to send.
+        remote : str
+            Unix-style destination path of file on remote system.
+
+        Returns
+        -------
+        None
+        """
+        sftp = self._open_sftp()
+        with open(local, 'rb') as fl:
+            with sftp.open(remote, 'wb', self.TRANSFER_CHUNK_SIZE) as fr:
+                fr.MAX_REQUEST_SIZE = self.TRANSFER_CHUNK_SIZE
+                fr.set_pipelined(True)
+                shutil.copyfileobj(fl, fr, self.TRANSFER_CHUNK_SIZE)
+
+
+    def _get_file(self, remote:str, local:str, size:int=None) -> None:
+        """
+        Gets a single file from remote system over SFTP. The whole file is
+        prefetched in TRANSFER_CHUNK_SIZE read requests.
+
+        Parameters
+        ----------
+        remote : str
+            Unix-style path of file on remote system to get.
+        local : str
+            Local destination path of file.
+        size : int, optional
+            Size of remote file in bytes, if already known from a previous
+            stat. If not given, the file is stat-ed before prefetching.
+
+        Returns
+        -------
+        None
+        """
+        sftp = self._open_sftp()
+        with sftp.open(remote, 'rb') as fr:
+            fr.MAX_REQUEST_SIZE = self.TRANSFER_CHUNK_SIZE
+            fr.prefetch(size)
+            with open(local, 'wb') as fl:
+                shutil.copyfileobj(fr, fl, self.TRANSFER_CHUNK_SIZE)
+
+
     def _parse_submit_script(self, job_config:dict) -> str:
         """
         Parses text to write for a SLURM job submission script on TACC.
@@ -254,36 +457,37 @@ class TACCJobManager():
 
         """
         # Format submit scripts with appropriate inputs for job
+        job_dir = job_config['job_dir']
         np = job_config['node_count']*job_config['processors_per_node']
-        header = SUBMIT_SCRIPT_TEMPLATE.format(
+        header = [SUBMIT_SCRIPT_TEMPLATE.format(
                 name=job_config['name'],
                 desc=job_config['desc'],
                 job_id=job_config['job_id'],
                 queue=job_config['queue'],
                 N=job_config['node_count'],
                 n=np,
-                rt=job_config['max_run_time'])
+                rt=job_config['max_run_time'])]
 
         # Add slurm directives for email and allocation if specified for job
         if 'email' in job_config.keys():
-            email_line =  "\n#SBATCH --mail-user={email} # Email to send to"
-            header += email_line.format(email=job_config['email'])
-            header += "\n#SBATCH --mail-type=all     # Email to send to"
+            header.append(f"#SBATCH --mail-user={job_config['email']}"
+                          " # Email to send to")
+            header.append("#SBATCH --mail-type=all     # Email to send to")
         if 'allocation' in job_config.keys():
-            alloc_line =  "\n#SBATCH -A {allocation} # Allocation name "
-            header += alloc_line.format(allocation=job_config['allocation'])
+            header.append(f"#SBATCH -A {job_config['allocation']}"
+                          " # Allocation name ")
 
         # End slurm directives
-        header += "\n#----------------------------------------------------\n"
+        header.append("#" + "-"*52 + "\n")
 
         # Build function arguments
         # always pass total number of MPI processes
         job_args = {"NP": np}
 
         # Add paths of job inputs (transferred to job dir) as argument
+        inputs_dir = f"{job_dir}/inputs"
         for arg, path in job_config['inputs'].items():
-            job_args[arg] = '/'.join([job_config['job_dir'], 'inputs',
-                                      os.path.basename(path)])
+            job_args[arg] = f"{inputs_dir}/{os.path.basename(path)}"
 
         # Add on parameters passed to job
         job_args.update(job_config['parameters'])
@@ -297,15 +501,15 @@ class TACCJobManager():
             value = f"'{value}'" if needs_quote else value
             export_list.append(f"export {arg}={value}")
 
-        # Parse final submit script
-        entry_path = f"{job_config['job_dir']}/{job_config['app']}"
+        # Parse final submit script, joining all parts once
+        entry_path = f"{job_dir}/{job_config['app']}"
         entry_path += f"/{job_config['entry_script']}"
-        submit_script = (
-            header                                 # set SBATCH params
-            + f"\ncd {job_config['job_dir']}\n\n"  # cd to job directory
-            + "\n".join(export_list)               # set job params
-            + f"\n{entry_path}"                    # run main script
-        )
+        submit_script = "".join([
+            "\n".join(header),          # set SBATCH params
+            f"\ncd {job_dir}\n\n",       # cd to job directory
+            "\n".join(export_list),     # set job params
+            f"\n{entry_path}",          # run main script
+        ])
 
         return submit_script
 
@@ -357,12 +561,11 @@ class TACCJobManager():
                             'username':x[2], 'state':x[3],
                             'nodes':x[4], 'remaining': x[4],
                             'start_time': x[5]}
-        lines = ret.split('\n')
+        job_statuses = ('ACTIVE', 'WAITING', 'BLOCKED', 'COMPLETING')
         jobs_line = False
         line_counter = -2
-        for l in lines:
-            job_statuses = ['ACTIVE', 'WAITING', 'BLOCKED', 'COMPLETING']
-            if any([l.startswith(x) for x in job_statuses]):
+        for l in ret.splitlines():
+            if l.startswith(job_statuses):
                 jobs_line=True
                 continue
             if jobs_line==True:
@@ -408,8 +611,8 @@ class TACCJobManager():
             raise tjm_error
 
         # Parse allocation info
-        allocations = set([x.strip() for x in ret.split('\n')[2].split('|')])
-        allocations.remove('')
+        allocations = {x.strip() for x in ret.splitlines()[2].split('|')}
+        allocations.discard('')
         allocations = [x.split() for x in allocations]
         allocations = [{'name':x[0],
                         'service_units': int(x[1]),
@@ -456,25 +659,25 @@ class TACCJobManager():
                     'st_mtime', 'st_size', 'st_uid']
 
             # Open sftp connection
-            with self._client.open_sftp() as sftp:
-                # Query path to see if its directory or file
-                lstat = sftp.lstat(path)
-
-                if stat.S_ISDIR(lstat.st_mode):
-                    # If directory get info on all files in directory
-                    f_attrs.insert(0, 'filename')
-                    files = sftp.listdir_attr(path)
-                    for f in files:
-                        # Extract fields from SFTPAttributes object for files
-                        d = dict([(x, f.__getattribute__(x)) for x in f_attrs])
-                        d['ls_str'] = f.asbytes()
-                        f_info.append(d)
-                else:
-                    # If file, just get file info
-                    d = [(x, lstat.__getattribute__(x)) for x in f_attrs]
-                    d.insert(0, ('filename', path))
-                    d.append(('ls_str', lstat.asbytes()))
-                    f_info.append(dict(d))
+            sftp = self._open_sftp()
+            # Query path to see if its directory or file
+            lstat = sftp.lstat(path)
+
+            if stat.S_ISDIR(lstat.st_mode):
+                # If directory get info on all files in directory
+                f_attrs.insert(0, 'filename')
+                files = sftp.listdir_attr(path)
+                for f in files:
+                    # Extract fields from SFTPAttributes object for files
+                    d = {x: getattr(f, x) for x in f_attrs}
+                    d['ls_str'] = f.asbytes()
+                    f_info.append(d)
+            else:
+                # If file, just get file info
+                d = {'filename': path}
+                d.update((x, getattr(lstat, x)) for x in f_attrs)
+                d['ls_str'] = lstat.asbytes()
+                f_info.append(d)
 
             # Return list of dictionaries with file info
             return f_info
@@ -551,8 +754,10 @@ class TACCJobManager():
         Sends file or folder from local path to remote path. If a file is
         specified, the remote path is the destination path of the file to be
         sent. If a folder is specified, all folder contents (recursive) are
-        compressed into a .tar.gz file before being sent and then the contents
-        are unpacked in the specified remote path.
+        streamed as a tar archive directly into tar on the remote system,
+        which unpacks them in the specified remote path. The archive is only
+        gzip compressed if most of the folder's contents are not already in a
+        compressed format (see `COMPRESSED_EXTS`).
 
         Parameters
         ----------
@@ -583,7 +788,7 @@ class TACCJobManager():
             on TACC system or access to local file/folder and contents.
         TJMCommandError
             If a directory is being sent, this error is thrown if there are any
-            issues unpacking the sent .tar.gz file in the destination directory.
+            issues unpacking the sent tar archive in the destination directory.
 
         Warnings
         --------
@@ -597,38 +802,22 @@ class TACCJobManager():
         remote_dir = '.' if remote_dir=='' else remote_dir
 
         try:
-            # Sending directory -> Package into tar file
+            # Sending directory -> Stream tar archive into remote tar
             if os.path.isdir(local):
-                fname = os.path.basename(local)
-                local_tar_file = f".{fname}.taccjm.tar"
-                remote_tar_file = f"{remote_dir}/.taccjm_temp_{fname}.tar"
-
-                # Package tar file -> Recursive call
-                with tarfile.open(local_tar_file, "w:gz") as tar:
-                    f = lambda x : x if fnmatch(x.name, file_filter) else None
-                    tar.add(local, arcname=remote_fname, filter=f)
-
-                # Send tar file
-                try:
-                    with self._client.open_sftp() as sftp:
-                        res = sftp.put(local_tar_file, remote_tar_file)
-                except Exception as e:
-                    # Remove local tar file before passing on exception
-                    os.remove(local_tar_file)
-                    raise e
-
-                # Remove local tar file that was just sent successfully
-                os.remove(local_tar_file)
-
-                # Now untar file in destination and remove remote tar file
-                # If tar command fails, the remove command should still work
-                untar_cmd = f"tar -xzvf {remote_tar_file} -C {remote_dir}; "
-                untar_cmd += f"rm -rf {remote_tar_file}"
-                _ = self._execute_command(untar_cmd)
+                # Skip gzip pass if contents won't shrink -> CPU bound
+                gz = self._compressible(local, remote_fname, file_filter)
+                def _send_tar(fp):
+                    # Stream mode, tar is built and sent as files are added
+                    with tarfile.open(fileobj=fp,
+                            mode="w|gz" if gz else "w|") as tar:
+                        f = lambda x : x if fnmatch(x.name, file_filter) else None
+                        tar.add(local, arcname=remote_fname, filter=f)
+
+                untar_cmd = f"tar -x{'z' if gz else ''}f - -C {remote_dir}"
+                _ = self._execute_command(untar_cmd, stdin=_send_tar)
             # Sending file
             elif os.path.isfile(local):
-                with self._client.open_sftp() as sftp:
-                    res = sftp.put(local, remote)
+                self._put_file(local, remote)
             else:
                 raise FileNotFoundError(errno.ENOENT,
                         os.strerror(errno.ENOENT), local)
@@ -641,6 +830,16 @@ class TACCJobManager():
             logger.error(msg)
             raise PermissionError(errno.EACCES, msg, p.filename)
         except TJMCommandError as t:
+            # tar errors on the destination dir, e.g. 'Cannot open: ...'
+            f_not_found = ['No such file or directory', 'Not a directory']
+            if 'Permission denied' in t.stderr:
+                msg = f"upload - Permission denied on {remote_dir}"
+                logger.error(msg)
+                raise PermissionError(errno.EACCES, msg, remote_dir)
+            elif any([x in t.stderr for x in f_not_found]):
+                msg = f"upload - No such file or folder {remote_dir}."
+                logger.error(msg)
+                raise FileNotFoundError(errno.ENOENT, msg, remote_dir)
             t.message = f"upload - Error unpacking tar file"
             logger.error(t.message)
             raise t
@@ -650,6 +849,53 @@ class TACCJobManager():
             raise e
 
 
+    @classmethod
+    def _compressible(cls, local:str, arcname:str,
+                      file_filter:str='*') -> bool:
+        """
+        Check whether it is worth gzip compressing a local folder before
+        sending it, i.e. whether at most half of the bytes to be sent are in
+        files with an already compressed format extension in `COMPRESSED_EXTS`.
+
+        Parameters
+        ----------
+        local : str
+            Path to local folder to check.
+        arcname : str
+            Name of folder in tar archive being sent. Paths in the archive,
+            starting with arcname, are what file_filter is matched against.
+        file_filter: str, optional, Default = '*'
+            Unix style pattern matching string of files to send, as in
+            upload(). Files and folders filtered out are not counted.
+
+        Returns
+        -------
+        compressible : bool
+            True if folder contents should be gzip compressed when sent.
+        """
+        # Nothing is sent, so nothing to compress, if folder is filtered out
+        total = compressed = 0
+        if not fnmatch(arcname, file_filter):
+            return False
+        for root, dirs, files in os.walk(local):
+            rel = os.path.relpath(root, local)
+            arc_root = arcname if rel=='.' else \
+                    posixpath.join(arcname, *rel.split(os.sep))
+
+            # Folders filtered out are skipped by tar along with their contents
+            dirs[:] = [d for d in dirs
+                       if fnmatch(posixpath.join(arc_root, d), file_filter)]
+            for f in files:
+                if not fnmatch(posixpath.join(arc_root, f), file_filter):
+                    continue
+                size = os.lstat(os.path.join(root, f)).st_size
+                total += size
+                if f.lower().endswith(cls.COMPRESSED_EXTS):
+                    compressed += size
+
+        return 2 * compressed <= total
+
+
     def download(self, remote:str, local:str, file_filter:str='*') -> None:
         """
         Downloads file or folder from remote path on TACC resource to local
@@ -699,47 +945,48 @@ class TACCJobManager():
         local = os.path.abspath(local.rstrip('/'))
         remote = remote.rstrip('/')
         try:
-            with self._client.open_sftp() as sftp:
-                fileattr = sftp.stat(remote)
-                is_dir = stat.S_ISDIR(fileattr.st_mode)
-                if is_dir:
-                    dirname, fname = posixpath.split(remote)
-                    remote_tar = f"{dirname}/{fname}.tar.gz"
-
-                    # Build command. Filter files according to file filter
-                    cmd = f"cd {dirname} && "
-                    cmd += f"find {fname} -name '{file_filter}' -print0 | "
-                    cmd += f"tar -czvf {remote_tar} --null --files-from -"
-
-                    # Try packing remote tar file
-                    try:
-                        self._execute_command(cmd)
-                    except TJMCommandError as t:
-                        if 'padding with zeros' in t.stdout:
-                            # Warning message, not an error.
-                            pass
-                        else:
-                            # Other error tar-ing file. Raise
-                            raise t
-
-                    # try to get tar file
-                    try:
-                        local_tar = f"{local}.tar.gz"
-                        sftp.get(remote_tar, local_tar)
-                    except Exception as e:
+            sftp = self._open_sftp()
+            fileattr = sftp.stat(remote)
+            is_dir = stat.S_ISDIR(fileattr.st_mode)
+            if is_dir:
+                dirname, fname = posixpath.split(remote)
+                remote_tar = f"{dirname}/{fname}.tar.gz"
+
+                # Build command. Filter files according to file filter
+                cmd = f"cd {shlex.quote(dirname)} && find {shlex.quote(fname)}"
+                cmd += f" -name '{file_filter}' -print0 | "
+                cmd += f"tar -czvf {shlex.quote(remote_tar)} --null --files-from -"
+
+                # Try packing remote tar file
+                try:
+                    self._execute_command(cmd)
+                except TJMCommandError as t:
+                    if 'padding with zeros' in t.stderr:
+                        # Warning message, not an error.
+                        pass
+                    else:
+                        # Other error tar-ing file. Raise
+                        raise t
+
+                # try to get tar file
+                try:
+                    local_tar = f"{local}.tar.gz"
+                    self._get_file(remote_tar, local_tar)
+                except Exception as e:
+                    if os.path.exists(local_tar):
                         os.remove(local_tar)
-                        raise e
+                    raise e
 
-                    # unpack tar file locally
-                    with tarfile.open(local_tar) as tar:
-                        tar.extractall(path=local)
+                # unpack tar file locally
+                with tarfile.open(local_tar) as tar:
+                    tar.extractall(path=local)
 
-                    # Remove local and remote tar files
-                    os.remove(local_tar)
-                    self._execute_command(f"rm -rf {remote_tar}")
-                else:
-                    # Get remote file
-                    sftp.get(remote, local)
+                # Remove local and remote tar files
+                os.remove(local_tar)
+                self._execute_command(f"rm -rf {shlex.quote(remote_tar)}")
+            else:
+                # Get remote file, size known from stat -> no second stat
+                self._get_file(remote, local, size=fileattr.st_size)
         except FileNotFoundError as f:
             msg = f"download - No such file or folder {f.filename}."
             logger.error(msg)
@@ -792,16 +1039,17 @@ class TACCJobManager():
         # Check if path is a file or directory
         is_dir = False
         try:
-            with self._client.open_sftp() as sftp:
-                fileattr = sftp.stat(abs_path)
-                is_dir = stat.S_ISDIR(fileattr.st_mode)
+            sftp = self._open_sftp()
+            fileattr = sftp.stat(abs_path)
+            is_dir = stat.S_ISDIR(fileattr.st_mode)
         except FileNotFoundError as f:
             msg = f"remove - No such file/folder {abs_path}"
             logger.error(msg)
             raise FileNotFoundError(errno.ENOENT, msg, abs_path)
 
         src_path  = abs_path if not is_dir else abs_path + '/'
-        cmnd = f"rsync -a {src_path} {trash_path} && rm -rf {abs_path}"
+        cmnd = f"rsync -a {shlex.quote(src_path)} {shlex.quote(trash_path)}"
+        cmnd += f" && rm -rf {shlex.quote(abs_path)}"
         try:
             ret = self._execute_command(cmnd)
         except TJMCommandError as tjm_error:
@@ -841,16 +1089,17 @@ class TACCJobManager():
         # Check if trash path is a file or directory
         is_dir = False
         try:
-            with self._client.open_sftp() as sftp:
-                fileattr = sftp.stat(trash_path)
-                is_dir = stat.S_ISDIR(fileattr.st_mode)
+            sftp = self._open_sftp()
+            fileattr = sftp.stat(trash_path)
+            is_dir = stat.S_ISDIR(fileattr.st_mode)
         except FileNotFoundError as f:
             msg = f"restore - file/folder {file_name} not in trash."
             logger.error(msg)
             raise FileNotFoundError(errno.ENOENT, msg, f.filename)
 
         src_path = f"{trash_path}/" if is_dir else trash_path
-        cmnd = f"rsync -a {src_path} {abs_path} && rm -rf {trash_path}"
+        cmnd = f"rsync -a {shlex.quote(src_path)} {shlex.quote(abs_path)}"
+        cmnd += f" && rm -rf {shlex.quote(trash_path)}"
         try:
             ret = self._execute_command(cmnd)
         except TJMCommandError as tjm_error:
@@ -906,12 +1155,12 @@ class TACCJobManager():
         if d_type not in [dict, str]:
             raise ValueError(f"Data type {d_type} is not supported")
         try:
-            with self._client.open_sftp() as sftp:
-                with sftp.open(path, 'w') as jc:
-                    if d_type==dict:
-                        json.dump(data, jc)
-                    else:
-                        jc.write(data)
+            sftp = self._open_sftp()
+            with sftp.open(path, 'w') as jc:
+                # Don't wait on server ack for every write request
+                jc.set_pipelined(True)
+                # Serialize up front -> single write instead of one per token
+                jc.write(json.dumps(data) if d_type==dict else data)
         except FileNotFoundError as f:
             msg = f"write - No such file or folder {f.filename}."
             logger.error(msg)
@@ -957,12 +1206,15 @@ class TACCJobManager():
         if data_type not in ['json', 'text']:
             raise ValueError(f"read - data type {data_type} is not supported")
         try:
-            with self._client.open_sftp() as sftp:
-                with sftp.open(path, 'r') as fp:
-                    if data_type=='json':
-                        data = json.load(fp)
-                    else:
-                        data = fp.read().decode('UTF-8')
+            sftp = self._open_sftp()
+            with sftp.open(path, 'r') as fp:
+                # Request all file blocks up front instead of one at a time.
+                # Sized read -> No extra request just to find end of file.
+                size = fp.stat().st_size
+                fp.prefetch(size)
+                data = fp.read(size).decode('UTF-8')
+                if data_type=='json':
+                    data = json.loads(data)
             return data
         except FileNotFoundError as f:
             msg = f"read - No such file or folder {f.filename}."
@@ -980,7 +1232,8 @@ class TACCJobManager():
 
     def get_apps(self) -> List[str]:
         """
-        Get list of applications deployed by TACCJobManager instance.
+        Get list of applications deployed by TACCJobManager instance. The list
+        is cached for APPS_CACHE_TTL seconds, and refreshed on deploy_app().
 
         Parameters
         ----------
@@ -992,14 +1245,35 @@ class TACCJobManager():
             List of applications deployed.
 
         """
-        apps = [f['filename'] for f in self.list_files(path=self.apps_dir)]
-        apps = [a for a in apps if not a.startswith('.')]
-        return apps
+        ts, apps = self._apps_cache
+        if apps is None or time.time() - ts >= self.APPS_CACHE_TTL:
+            apps = [f['filename'] for f in self.list_files(path=self.apps_dir)
+                    if not f['filename'].startswith('.')]
+            self._clear_apps_cache()
+            self._apps_cache = (time.time(), apps)
+
+        return list(apps)
+
+
+    def _clear_apps_cache(self) -> None:
+        """
+        Clear cached list of deployed apps and app configs.
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None
+        """
+        self._apps_cache = (0, None)
+        self._app_configs = {}
 
 
     def get_app(self, app_id:str) -> dict:
         """
         Get application config for app deployed at TACCJobManager.apps_dir.
+        Configs are cached along with the list of deployed apps.
 
         Parameters
         ----------
@@ -1025,11 +1299,13 @@ class TACCJobManager():
             logger.error(msg)
             raise ValueError(msg)
 
-        # Load application config
-        app_config_path = '/'.join([self.apps_dir, app_id, 'app.json'])
-        app_config = self.read(app_config_path, data_type='json')
+        # Load application config, if not cached already
+        if app_id not in self._app_configs:
+            app_config_path = f"{self.apps_dir}/{app_id}/app.json"
+            self._app_configs[app_id] = self.read(app_config_path,
+                                                  data_type='json')
 
-        return app_config
+        return copy.deepcopy(self._app_configs[app_id])
 
 
     def deploy_app(self,
@@ -1076,16 +1352,13 @@ class TACCJobManager():
 
         # Load templated app configuration
         if app_config is None:
-            with open(os.path.join(local_app_dir, app_config_file), 'r') as fp:
-                app_config = json.load(fp)
+            app_config = load_json_file(
+                    os.path.join(local_app_dir, app_config_file))
 
 
         # Update with kwargs
         app_config.update(**kwargs)
 
-        # Get current apps already deployed
-        cur_apps = self.get_apps()
-
         # Required parameters for application configuration
         missing = set(APP_TEMPLATE.keys()) - set(app_config.keys())
         if len(missing)>0:
@@ -1093,6 +1366,10 @@ class TACCJobManager():
             logger.error(msg)
             raise ValueError(msg)
 
+        # Get current apps already deployed, not relying on cached list
+        self._clear_apps_cache()
+        cur_apps = self.get_apps()
+
         # Only overwrite previous version of app if overwrite is set.
         if (app_config['name'] in cur_apps) and (not overwrite):
             msg = f"deploy_app - {app_config['name']} already exists."
@@ -1102,18 +1379,20 @@ class TACCJobManager():
         try:
             # Now try and send application data and config to system
             local_app_dir = os.path.join(local_app_dir, 'assets')
-            remote_app_dir = '/'.join([self.apps_dir, app_config['name']])
+            remote_app_dir = f"{self.apps_dir}/{app_config['name']}"
             self.upload(local_app_dir, remote_app_dir)
 
             # Put app config in deployed app folder
-            app_config_path = '/'.join([remote_app_dir, 'app.json'])
+            app_config_path = f"{remote_app_dir}/app.json"
             self.write(app_config, app_config_path)
+            self._clear_apps_cache()
 
             # Make entry point script executable
             entry_script = f"{remote_app_dir}/{app_config['entry_script']}"
-            self._execute_command(f"chmod +x {entry_script}")
+            self._execute_command(f"chmod +x {shlex.quote(entry_script)}")
 
         except Exception as e:
+            self._clear_apps_cache()
             msg = f"deploy_app - Unable to stage appplication data."
             logger.error(msg)
             raise e
@@ -1135,8 +1414,8 @@ class TACCJobManager():
             List of jobs contained deployed.
 
         """
-        jobs = [f['filename'] for f in self.list_files(path=self.jobs_dir)]
-        jobs = [j for j in jobs if not j.startswith('.')]
+        jobs = [f['filename'] for f in self.list_files(path=self.jobs_dir)
+                if not f['filename'].startswith('.')]
         return jobs
 
 
@@ -1162,7 +1441,7 @@ class TACCJobManager():
 
         """
         try:
-            job_config_path = '/'.join([self.jobs_dir, job_id, 'job.json'])
+            job_config_path = f"{self.jobs_dir}/{job_id}/job.json"
             return self.read(job_config_path, data_type='json')
         except FileNotFoundError as e:
             # Invalid job ID because job doesn't exist
@@ -1217,8 +1496,8 @@ class TACCJobManager():
         """
         # Load from json file if job conf dictionary isn't specified
         if job_config is None:
-            with open(os.path.join(local_job_dir, job_config_file), 'r') as fp:
-                job_config = json.load(fp)
+            job_config = load_json_file(
+                    os.path.join(local_job_dir, job_config_file))
 
         # Overwrite job_config loaded with kwargs keyword arguments if specified
         job_config = update_dic_keys(job_config, **kwargs)
@@ -1253,54 +1532,73 @@ class TACCJobManager():
 
         if stage:
             # Stage job inputs
+            created = False
             if not any([job_config.get(x) for x in ['job_id', 'job_dir']]):
                 # If job_id/job_dir has not been assigned, job hasn't been
                 # set up before, so must create job directory.
-                ts = datetime.fromtimestamp(
-                        time.time()).strftime('%Y%m%d_%H%M%S')
-                job_config['job_id'] = '{job_name}_{ts}'.format(
-                        job_name=job_config['name'], ts=ts)
-                job_config['job_dir'] = '{job_dir}/{job_id}'.format(
-                        job_dir=self.jobs_dir, job_id=job_config['job_id'])
+                ts = time.strftime('%Y%m%d_%H%M%S')
+                job_config['job_id'] = f"{job_config['name']}_{ts}"
+                job_config['job_dir'] = posixpath.join(self.jobs_dir,
+                                                       job_config['job_id'])
 
                 # Make job directory
                 self._mkdir(job_config['job_dir'])
+                created = True
 
-            # Utility function to clean-up job directory and raise error
+            # Utility function to clean-up job directory and raise error. Only
+            # removes job directory if it was created here, not pre-existing.
             job_dir = job_config['job_dir']
             def err(e, msg):
-                self._execute_command(f"rm -rf {job_dir}")
+                if created:
+                    self._execute_command(f"rm -rf {shlex.quote(job_dir)}")
                 logger.error(f"deploy_job - {msg}")
                 raise e
 
-            # Copy app contents to job directory
-            cmnd = 'cp -r {apps_dir}/{app} {job_dir}/{app}'.format(
-                    apps_dir=self.apps_dir,
-                    app=job_config['app'],
-                    job_dir=job_dir)
+            # Copy app contents to job directory and make inputs directory
+            inputs_path = posixpath.join(job_dir, 'inputs')
+            app_src = shlex.quote(f"{self.apps_dir}/{job_config['app']}")
+            app_dest = shlex.quote(f"{job_dir}/{job_config['app']}")
+            cmnd = f"cp -r {app_src} {app_dest}"
+            if len(job_config['inputs'])>0:
+                cmnd += f" && mkdir -p {shlex.quote(inputs_path)}"
             try:
                 ret = self._execute_command(cmnd)
             except TJMCommandError as t:
                 err(t, "Error copying app assets to job dir")
 
-            # Send job input data to job directory
-            if len(job_config['inputs'])>0:
-                inputs_path = posixpath.join(job_dir, 'inputs')
-                self._mkdir(inputs_path)
-                for arg, path in job_config['inputs'].items():
-                    arg_dest_path = posixpath.join(inputs_path,
-                            posixpath.basename(path))
-                    try:
-                        self.upload(path, arg_dest_path)
-                    except Exception as e:
-                        err(e, f"Error staging input {arg} with path {path}")
-
-            # Parse and write submit_script to job_directory, and chmod it
-            submit_script_path = f"{job_dir}/submit_script.sh"
+            # Send job input data to job directory. A single input is sent on
+            # this thread's reused SFTP session, several are sent in parallel.
+            inputs = [(arg, path, posixpath.join(inputs_path,
+                                                 posixpath.basename(path)))
+                      for arg, path in job_config['inputs'].items()]
+            if len(inputs)==1:
+                arg, path, arg_dest_path = inputs[0]
+                try:
+                    self.upload(path, arg_dest_path)
+                except Exception as e:
+                    err(e, f"Error staging input {arg} with path {path}")
+            elif len(inputs)>1:
+                n_workers = min(self.MAX_TRANSFER_WORKERS, len(inputs))
+                with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                    uploads = [(arg, path, pool.submit(self._upload_input,
+                                                       path, arg_dest_path))
+                               for arg, path, arg_dest_path in inputs]
+
+                # Clean up only once all transfers are done
+                for arg, path, f in uploads:
+                    if f.exception() is not None:
+                        err(f.exception(),
+                            f"Error staging input {arg} with path {path}")
+
+            # Parse submit_script, write it to job directory and chmod it in a
+            # single command, with script streamed via stdin -> One round trip
+            submit_script_path = shlex.quote(f"{job_dir}/submit_script.sh")
             try:
                 submit_script = self._parse_submit_script(job_config)
-                self.write(submit_script, submit_script_path)
-                self._execute_command(f"chmod +x {submit_script_path}")
+                cmnd = f"cat > {submit_script_path} && "
+                cmnd += f"chmod +x {submit_script_path}"
+                self._execute_command(cmnd,
+                        stdin=lambda fp: fp.write(submit_script.encode()))
             except Exception as e:
                 err(e, f"Error parsing or staging job submit script.")
 
@@ -1311,6 +1609,28 @@ class TACCJobManager():
         return job_config
 
 
+    def _upload_input(self, local:str, remote:str) -> None:
+        """
+        Upload a job input from a worker thread, using (and then closing) the
+        worker thread's own SFTP session.
+
+        Parameters
+        ----------
+        local : str
+            Path to local file or folder to send to TACC system.
+        remote : str
+            Destination unix-style path on the TACC system.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            self.upload(local, remote)
+        finally:
+            self._close_sftp()
+
+
     def submit_job(self, job_id:str) -> dict:
         """
         Submit job to remote system job queue.
@@ -1338,8 +1658,8 @@ class TACCJobManager():
             raise ValueError(msg)
 
         # Submit to SLURM queue -> Note we do this from the job_directory
-        cmnd = f"cd {job_config['job_dir']}; "
-        cmnd += f"sbatch {job_config['job_dir']}/submit_script.sh"
+        job_dir = shlex.quote(job_config['job_dir'])
+        cmnd = f"cd {job_dir}; sbatch {job_dir}/submit_script.sh"
         ret = self._execute_command(cmnd)
         if '\nFAILED\n' in ret:
             raise TJMCommandError(self.system, self.user, cmnd, 0, '', ret,
@@ -1423,7 +1743,7 @@ class TACCJobManager():
             pass
 
         # Remove job directory, if it still exists
-        job_dir = '/'.join([self.jobs_dir, job_id])
+        job_dir = f"{self.jobs_dir}/{job_id}"
         try:
             self.remove(job_dir)
         except:
@@ -1453,7 +1773,7 @@ class TACCJobManager():
             not exist.
         """
         # Unix paths -> Get file remote file name and directory
-        job_dir = '/'.join([self.jobs_dir, job_id])
+        job_dir = f"{self.jobs_dir}/{job_id}"
 
         try:
             self.restore(job_dir)
@@ -1494,7 +1814,7 @@ class TACCJobManager():
                 - asbytes  : Output from an ls -lat like command on file.
         """
         # Get files from particular directory in job
-        fpath ='/'.join([self.jobs_dir, job_id, path])
+        fpath = f"{self.jobs_dir}/{job_id}/{path}"
         files = self.list_files(path=fpath)
 
         return files
@@ -1528,15 +1848,14 @@ class TACCJobManager():
         """
         # Downlaod to local job dir
         path = path[:-1] if path[-1]=='/' else path
-        fname = '/'.join(path.split('/')[-1:])
-        job_folder = '/'.join(path.split('/')[:-1])
+        fname = posixpath.basename(path)
 
         # Make local data directory if it doesn't exist already
         local_data_dir = os.path.join(dest_dir, job_id)
         os.makedirs(local_data_dir, exist_ok=True)
 
         # Get file
-        src_path = '/'.join([self.jobs_dir, job_id, path])
+        src_path = f"{self.jobs_dir}/{job_id}/{path}"
         dest_path = os.path.join(local_data_dir, fname)
         try:
             self.download(src_path, dest_path, file_filter=file_filter)
@@ -1578,11 +1897,9 @@ class TACCJobManager():
         """
         # Downlaod to local job dir
         path = path[:-1] if path[-1]=='/' else path
-        fname = '/'.join(path.split('/')[-1:])
-        job_folder = '/'.join(path.split('/')[:-1])
 
         # Get data
-        src_path = '/'.join([self.jobs_dir, job_id, path])
+        src_path = f"{self.jobs_dir}/{job_id}/{path}"
         try:
             data = self.read(src_path, data_type=data_type)
         except Exception as e:
@@ -1634,7 +1951,7 @@ class TACCJobManager():
         try:
             # Get destination directory in job path to send file to
             fname = os.path.basename(os.path.normpath(path))
-            dest_path = '/'.join([self.jobs_dir, job_id, dest_dir, fname])
+            dest_path = f"{self.jobs_dir}/{job_id}/{dest_dir}/{fname}"
 
             self.upload(path, dest_path, file_filter=file_filter)
         except Exception as e:
@@ -1683,7 +2000,7 @@ class TACCJobManager():
         """
         try:
             # Get destination directory in job path to send file to
-            dest_path = '/'.join([self.jobs_dir, job_id, path])
+            dest_path = f"{self.jobs_dir}/{job_id}/{path}"
             self.write(data, dest_path)
         except Exception as e:
             msg = f"write_job_file - Unable to write file {path}."
@@ -1718,7 +2035,7 @@ class TACCJobManager():
             is invalid does not exist.
         """
         # Load job config
-        path = '/'.join([self.jobs_dir, job_id, path])
+        path = f"{self.jobs_dir}/{job_id}/{path}"
 
         try:
             return self.peak_file(path, head=head, tail=tail)
@@ -1755,16 +2072,15 @@ class TACCJobManager():
         remote_path = posixpath.join(self.scripts_dir, script_name)
 
         # If python file, add directive to python3 path on TACC system
+        with open(local_fname, 'rb') as fp:
+            script = fp.read()
         if ext == ".py":
-            script = "#!" + self.python_path + "\n"
-            with open(local_fname, 'r') as fp:
-                script += fp.read()
-            self.write(script, remote_path)
-        else:
-            self.upload(local_fname, remote_path)
+            script = f"#!{self.python_path}\n".encode() + script
 
-        # Make remote script executable
-        self._execute_command(f"chmod +x {remote_path}")
+        # Write script and make it executable in a single remote command
+        remote_path = shlex.quote(remote_path)
+        cmnd = f"cat > {remote_path} && chmod +x {remote_path}"
+        self._execute_command(cmnd, stdin=lambda fp: fp.write(script))
 
 
     def run_script(self,
@@ -1789,7 +2105,7 @@ class TACCJobManager():
         out : str
             The standard output of the script.
         """
-        if job_id is not None: args.insert(0, '/'.join([self.jobs_dir,job_id]))
+        if job_id is not None: args.insert(0, f"{self.jobs_dir}/{job_id}")
 
         run_cmd = f"{self.scripts_dir}/{script_name} {' '.join(args)}"
         return self._execute_command(run_cmd)
@@ -1,59 +1,78 @@
 import pdb
 import time
+import asyncio
 import begin
 import logging
-import datetime
 import numpy as np
 from pathlib import Path
-from threading import Timer
-from contextlib import contextmanager
 from pythonjsonlogger import jsonlogger
 import sys
 
 from taccjm import taccjm_client as tc
 
-global stats
-stats = np.array([])
+# Ring buffer of api call times for the last MAX_STATS heartbeats
+MAX_STATS = 10000
+global stats, num_calls
+stats = np.empty(MAX_STATS, dtype=np.float64)
+num_calls = 0
 _logger = None
 
 def get_stats():
-    global stats
-    num_calls = len(stats)
-    avg_time = stats.mean()
-    std_dev = stats.std()
-    msg = f'HEARTBEAT STATS\n\rNum calls = {num_calls}\n\t'
-    msg += f'Average time per call= {avg_time}s\n\tStd Dev time = {std_dev}s\n'
-    _logger.info(msg, extra={'num_calls':num_calls,
-                             'avg_time':avg_time, 'std_dev':std_dev})
+    global stats, num_calls
+    valid = stats[:min(num_calls, MAX_STATS)]
+    avg_time = valid.mean()
+    std_dev = valid.std()
+    _logger.info('HEARTBEAT STATS\n\rNum calls = %d\n\t'
+                 'Average time per call= %fs\n\tStd Dev time = %fs\n',
+                 num_calls, avg_time, std_dev,
+                 extra={'num_calls':num_calls,
+                        'avg_time':avg_time, 'std_dev':std_dev})
 
+    return num_calls, avg_time, std_dev
 
-@contextmanager
-def timing(label:str):
-    t0 = time.perf_counter()
-    yield lambda: (label, t1 - t0)
-    t1 = time.perf_counter()
 
+class Timing():
+    """Context manager recording time elapsed, in seconds, within its block."""
 
-class RepeatingTimer(Timer):
-    def run(self):
-        while not self.finished.is_set():
-            self.function(*self.args, **self.kwargs)
-            self.finished.wait(self.interval)
+    def __init__(self, label:str):
+        self.label = label
+        self.elapsed = None
+
+    def __enter__(self):
+        self._t0 = time.monotonic_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = (time.monotonic_ns() - self._t0) / 1e9
+        return False
+
+
+async def heartbeat_loop(interval:float):
+    """
+    Make a heartbeat call every `interval` seconds, until cancelled. Calls are
+    blocking HTTP requests, so they are run in a worker thread to keep the
+    event loop free.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await loop.run_in_executor(None, heartbeat)
+        await asyncio.sleep(interval)
 
 
 def heartbeat():
     try:
-        global stats
-        heartbeat_ts = datetime.datetime.fromtimestamp(time.time()).strftime('%Y%m%d_%H%M%S')
+        global stats, num_calls
+        heartbeat_ts = time.strftime('%Y%m%d_%H%M%S')
         _logger.info('Stearting heartbeat list_jm call')
-        with timing('list_jm') as api_time:
+        with Timing('list_jm') as api_time:
             res = tc.list_jms()
-        stats = np.append(stats, api_time()[1])
-        _logger.info('%s Done in %.6f s' % api_time(), extra={'api_time':api_time()[1], 'jms':res})
+        stats[num_calls % MAX_STATS] = api_time.elapsed
+        num_calls += 1
+        _logger.info('%s Done in %.6f s', api_time.label, api_time.elapsed,
+                     extra={'api_time':api_time.elapsed, 'jms':res})
         get_stats()
     except Exception as e:
-        msg = f'Heartbeat failed to make list_jm call {e}'
-        _logger.error(msg)
+        _logger.error('Heartbeat failed to make list_jm call %s', e)
 
 
 @begin.start(auto_convert=True)
@@ -89,13 +108,12 @@ def run(host: 'Host where server is running' = 'localhost',
     _logger.setLevel(logging.DEBUG)
 
     # Set endpoint for taccjm server
-    _logger.info(f"Setting host and port to ({host}, {port})",
+    _logger.info("Setting host and port to (%s, %s)", host, port,
                  extra={'host': host, 'port':port})
     tc.set_host(host=host, port=port)
 
     # Start heartbeat timer
     h_int = heartbeat_interval*60.0
-    _logger.info(f"Starting heartbeat every {h_int}s = {heartbeat_interval}m",
+    _logger.info("Starting heartbeat every %ss = %sm", h_int, heartbeat_interval,
                  extra={'host': host, 'port':port})
-    t = RepeatingTimer(h_int, heartbeat)
-    t.start()
+    asyncio.run(heartbeat_loop(h_int))
@@ -8,9 +8,11 @@ import pdb
 import os                       # OS system utility functions
 import re
 import json                     # For reading/writing dictionary<->json
+import copy                     # For returning copies of cached configs
 import errno                    # For error messages
 import configparser             # For reading configs
 from typing import Tuple        # For type hinting
+from functools import lru_cache # For caching parsed config files
 from taccjm.constants import JOB_TEMPLATE, APP_TEMPLATE, APP_SCRIPT_TEMPLATE
 from prettytable import PrettyTable
 
@@ -47,6 +49,48 @@ def update_dic_keys(d:dict, **kwargs) -> dict:
 
     return d
 
+@lru_cache(maxsize=64)
+def _load_json_file(path:str, mtime_ns:int, size:int) -> dict:
+    """Parse json file. Cached on path and file stats by lru_cache."""
+    with open(path, 'r') as fp:
+        return json.load(fp)
+
+
+def load_json_file(path:str) -> dict:
+    """
+    Load a local json config file, such as an app or job config. Parsed
+    files are cached by path, modification time, and size, so repeatedly
+    loading an unchanged file does not re-read and re-parse it.
+
+    Parameters
+    ----------
+    path : str
+        Path to local json file.
+
+    Returns
+    -------
+    config : dict
+        Copy of dictionary parsed from json file, safe to modify.
+
+    Raises
+    -------
+    FileNotFoundError
+        If file does not exist.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return copy.deepcopy(_load_json_file(path, st.st_mtime_ns, st.st_size))
+
+
+def clear_json_cache() -> None:
+    """
+    Clear cache of parsed json files used by load_json_file. Only needed if a
+    file may have been modified without changing its modification time or
+    size, since any such change already invalidates its cached entry.
+    """
+    _load_json_file.cache_clear()
+
+
 def create_template_app(name:str,
         dest_dir:str='.',
         app_config:dict=APP_TEMPLATE,
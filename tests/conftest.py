@@ -7,13 +7,84 @@
     - https://docs.pytest.org/en/stable/writing_plugins.html
 """
 
+import os
 import pytest
+import posixpath
+from dotenv import load_dotenv
+from unittest.mock import MagicMock
+
+from taccjm.TACCJobManager import TACCJobManager
 
 
 def pytest_addoption(parser):
     parser.addoption("--mfa", action="store",
             default="012345", help="MFA token. Must be provided")
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mfa(request):
     return request.config.getoption("--mfa")
+
+@pytest.fixture(scope="session")
+def env():
+    """
+    TACC account params for integration tests, read once per test session.
+    Note .env file in tests directory must contain bellow params:
+        - TACCJM_USER
+        - TACCJM_PW
+        - TACCJM_SYSTEM
+        - TACCJM_ALLOCATION
+    """
+    load_dotenv()
+    return {"USER": os.environ["TACCJM_USER"],
+            "PW": os.environ["TACCJM_PW"],
+            "SYSTEM": os.environ["TACCJM_SYSTEM"],
+            "ALLOCATION": os.environ["TACCJM_ALLOCATION"]}
+
+@pytest.fixture(scope="session")
+def jm(env, mfa):
+    """
+    TACCJobManager shared by all tests. Connected (and 2FA authenticated) only
+    once per test session, and closed once all tests are done.
+    """
+    jm = TACCJobManager(env["SYSTEM"], user=env["USER"], psw=env["PW"],
+            mfa=mfa, working_dir="test-taccjm")
+    yield jm
+    jm.close()
+
+@pytest.fixture(scope="session")
+def remote_test_dir(jm, tmp_path_factory):
+    """
+    Remote folder containing a test.txt file, uploaded once per test session
+    for tests that only read remote files. Removed once all tests are done.
+    """
+    local = tmp_path_factory.mktemp("remote_test_dir")
+    (local / "test.txt").write_text("hello world\nhello again\n")
+    taccjm_dir = posixpath.dirname(jm.trash_dir)
+    remote = posixpath.join(taccjm_dir, "session_test_dir")
+    jm.upload(str(local), remote)
+    yield remote
+    jm._execute_command(f"rm -rf {remote}")
+
+
+def _mock_transport(rc, out=b'', err=b''):
+    """Mock ssh transport whose commands all exit with `rc`, `out`, `err`."""
+    channel = MagicMock()
+    channel.recv_exit_status.return_value = rc
+    channel.exit_status_ready.return_value = True
+    fo = channel.makefile.return_value.__enter__.return_value
+    fo.read.return_value = out
+    fe = channel.makefile_stderr.return_value.__enter__.return_value
+    fe.read.return_value = err
+    transport = MagicMock()
+    transport.open_session.return_value = channel
+    return transport
+
+@pytest.fixture
+def good_transport():
+    """Mock ssh transport whose commands all succeed, printing 'test'."""
+    return _mock_transport(0, out=b'test\n')
+
+@pytest.fixture
+def bad_transport():
+    """Mock ssh transport whose commands all fail with return code 1."""
+    return _mock_transport(1, err=b'mock command error')
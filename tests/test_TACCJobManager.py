@@ -5,12 +5,14 @@ Tests for TACC JobManager Class
 """
 import os
 import pdb
+import json
 import time
+import shutil
 import pytest
 import posixpath
-from dotenv import load_dotenv
 from unittest.mock import patch
-from taccjm.utils import create_template_app
+from concurrent.futures import ThreadPoolExecutor
+from taccjm.utils import create_template_app, load_json_file, clear_json_cache
 
 from taccjm.TACCJobManager import TACCJobManager, TJMCommandError
 from taccjm.SSHClient2FA import SSHClient2FA
@@ -20,103 +22,133 @@ __author__ = "Carlos del-Castillo-Negrete"
 __copyright__ = "Carlos del-Castillo-Negrete"
 __license__ = "MIT"
 
-# Note: .env file in tests directory must contain bellow params to run tests:
-#   - TACC_USER
-#   - TACC_PW
-#   - TACC_SYSTEM
-#   - TACC_ALLOCATION
-load_dotenv()
-
-global SYSTEM, USER, PW, SYSTEM, ALLOCATION
-USER = os.environ.get("TACCJM_USER")
-PW = os.environ.get("TACCJM_PW")
-SYSTEM = os.environ.get("TACCJM_SYSTEM")
-ALLOCATION = os.environ.get("TACCJM_ALLOCATION")
-
-# JM will be the job manager instance that should be initialized once but used
-# by all tests. Note the test_init test initializes the JM to begin with,
-# but if only running one other test, the first test to run will initialize
-# the JM for the test session.
-JM = None
-
-def _init_TACCJobManager_tests():
-    """ Initializes JM for tests """
-    global JM
-    mfa = input('\nTACC Token:')
-    JM = TACCJobManager(SYSTEM, user=USER,
-        psw=PW, mfa=mfa, working_dir="test-taccjm")
-
-
-def _setup_local_test_files():
-    """Setup test directory and file"""
-    # Create a test file and folder
-    cwd = os.getcwd()
+@pytest.fixture
+def local_test_files(tmp_path):
+    """
+    Local test folder with a test file in it. Created in pytest's tmp_path,
+    so unique per test and cleaned up by pytest.
+    """
     test_fname = "test.txt"
-    test_folder = f"{cwd}/.test"
-    test_file = f"{test_folder}/{test_fname}"
-    _ = os.system(f"rm -rf {test_folder}")
-    _ = os.system(f"mkdir {test_folder}")
-    _ = os.system(f"echo hello world > {test_file}")
-    _ = os.system(f"echo hello again >> {test_file}")
+    test_folder = tmp_path / ".test"
+    test_file = test_folder / test_fname
+    test_folder.mkdir()
+    test_file.write_text("hello world\nhello again\n")
 
-    return test_fname, test_file, test_folder
+    return test_fname, str(test_file), str(test_folder)
 
-def _cleanup_local_test_files():
-    """Remove test directory and file"""
-    cwd = os.getcwd()
-    test_folder = f"{cwd}/.test"
-    _ = os.system(f"rm -rf {test_folder}")
 
-
-def test_init():
+def test_init(jm, good_transport, bad_transport):
     """Testing initializing class and class helper functions"""
 
-    # Invalid TACC system specified
-    with pytest.raises(ValueError):
-        bad = TACCJobManager("foo", user=USER, psw=PW, mfa=123456)
-
-    # Invalid working directory specified, no tricky business allowed with ..
-    with pytest.raises(ValueError):
-        bad = TACCJobManager(SYSTEM, user=USER,
-                psw=PW, mfa=123456, working_dir="../test-taccjm")
-    with pytest.raises(ValueError):
-        bad = TACCJobManager(SYSTEM, user=USER,
-                psw=PW, mfa=123456, working_dir="test-taccjm/..")
-    with pytest.raises(ValueError):
-        bad = TACCJobManager(SYSTEM, user=USER,
-                psw=PW, mfa=123456, working_dir="test-taccjm/../test")
+    # Placeholder account params, validation fails before any connection
+    system, user, pw = TACCJobManager.SYSTEMS[0], 'test', 'test'
+
+    # Invalid system/working dirs should fail validation before connecting
+    with patch.object(SSHClient2FA, 'connect') as connect:
+        # Invalid TACC system specified
+        with pytest.raises(ValueError):
+            bad = TACCJobManager("foo", user=user, psw=pw, mfa=123456)
+
+        # Invalid working directory specified, no tricky business with ..
+        with pytest.raises(ValueError):
+            bad = TACCJobManager(system, user=user,
+                    psw=pw, mfa=123456, working_dir="../test-taccjm")
+        with pytest.raises(ValueError):
+            bad = TACCJobManager(system, user=user,
+                    psw=pw, mfa=123456, working_dir="test-taccjm/..")
+        with pytest.raises(ValueError):
+            bad = TACCJobManager(system, user=user,
+                    psw=pw, mfa=123456, working_dir="test-taccjm/../test")
+        connect.assert_not_called()
 
     # Command that should work, also test printing to stdout the output
-    assert JM._execute_command('echo test') == 'test\n'
+    assert jm._execute_command('echo test') == 'test\n'
+
+    # Output is read to EOF in one blocking read, no polling of the channel
+    with patch.object(SSHClient2FA, 'get_transport',
+            return_value=good_transport):
+        assert jm._execute_command('echo test') == 'test\n'
+    channel = good_transport.open_session.return_value
+    fo = channel.makefile.return_value.__enter__.return_value
+    fo.read.assert_called_once_with()
+    channel.recv.assert_not_called()
+    channel.recv_ready.assert_not_called()
+
+    # More stderr than fits in the channel window, before stdout is closed
+    out = jm._execute_command(f"head -c {2*SSHClient2FA.WINDOW_SIZE} "
+                              "/dev/zero >&2 ; echo test")
+    assert out=='test\n'
 
      # Tests command that fails due to SSH error, which we mock
     with patch.object(SSHClient2FA, 'get_transport',
             side_effect=SSHException('Mock ssh exception')):
         with pytest.raises(SSHException):
-             JM._execute_command('echo test')
+             jm._execute_command('echo test')
 
-    # Test commands that fails because of non-zero return code
-    with pytest.raises(TJMCommandError):
-        JM._execute_command('foo')
+    # Stream large input to a command's stdin
+    data = os.urandom(2**22)
+    out = jm._execute_command('wc -c', stdin=lambda fp: fp.write(data))
+    assert int(out)==len(data)
+
+    # Channel is closed if streaming stdin fails, so command doesn't hang
+    def bad_stdin(fp):
+        raise ValueError('Mock stdin error')
+    with patch.object(SSHClient2FA, 'get_transport',
+            return_value=good_transport):
+        with pytest.raises(ValueError):
+            jm._execute_command('cat', stdin=bad_stdin)
+    good_transport.open_session.return_value.close.assert_called_once_with()
+
+    # Batch of commands in one exec, each with its own output and return code
+    res = jm._execute_commands(['echo test', 'printf hi', 'exit 3'])
+    assert res==[('test\n', 0), ('hi', 0), ('', 3)]
+
+    # Trailing comment in a command doesn't swallow the following commands
+    res = jm._execute_commands(['echo a # comment', 'echo b'])
+    assert res==[('a\n', 0), ('b\n', 0)]
+
+    # Error - Output can't be split into a result per command (mocked)
+    with patch.object(TACCJobManager, '_execute_command',
+            return_value='test\n'):
+        with pytest.raises(TJMCommandError):
+            jm._execute_commands(['echo test', 'echo test'])
+
+    # Test commands that fails because of non-zero return code (mocked)
+    with patch.object(SSHClient2FA, 'get_transport',
+            return_value=bad_transport):
+        with pytest.raises(TJMCommandError) as t:
+            jm._execute_command('foo')
+        assert t.value.rc==1 and t.value.stderr=='mock command error'
 
     # Test making directory (remove it first)
-    test_dir = posixpath.join(JM.trash_dir, 'test')
+    test_dir = posixpath.join(jm.trash_dir, 'test')
     try:
-        JM._execute_command(f"rmdir {test_dir}")
+        jm._execute_command(f"rmdir {test_dir}")
     except:
         pass
-    JM._mkdir(test_dir)
+    jm._mkdir(test_dir)
 
     # Test making directory that will fail
     with pytest.raises(TJMCommandError):
-        JM._mkdir(posixpath.join(JM.trash_dir, 'test/will/fail'))
+        jm._mkdir(posixpath.join(jm.trash_dir, 'test/will/fail'))
+
+    # SFTP session should be reused, and re-opened once closed
+    sftp = jm._open_sftp()
+    assert jm._open_sftp() is sftp
 
+    # SFTP channel should use the larger transport window and packet sizes
+    channel = sftp.get_channel()
+    assert channel.in_window_size==SSHClient2FA.WINDOW_SIZE
+    assert channel.in_max_packet_size==SSHClient2FA.MAX_PACKET_SIZE
+    sftp.close()
+    assert jm._open_sftp() is not sftp
 
-def test_showq():
+
+def test_showq(jm):
     """Test accessing TACC queue"""
 
     # Get queue for all users
-    queue = JM.showq(user='all')
+    queue = jm.showq(user='all')
     assert len(queue)>0
     queue_fields = ['job_id', 'job_name', 'username',
             'state', 'nodes', 'remaining', 'start_time']
@@ -124,186 +156,227 @@ def test_showq():
 
     # Fail to get queue
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'showq', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'showq', 1,
                             'mock error', '', 'mock error')):
         with pytest.raises(TJMCommandError) as t:
-            bad_queue = JM.showq()
+            bad_queue = jm.showq()
 
 
-def test_get_allocations():
+def test_get_allocations(jm):
     """Test accessing TACC allocations"""
 
     # Get allocations
-    allocations = JM.get_allocations()
+    allocations = jm.get_allocations()
     assert len(allocations)>0
     allocation_fields = ['name', 'service_units', 'exp_date']
     assert all([a in allocations[0].keys() for a in allocation_fields])
 
     # Fail to get allocations
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER,
+            side_effect=TJMCommandError(jm.system, jm.user,
                 '/usr/local/etc/taccinfo', 1, 'mock error', '', 'mock error')):
         with pytest.raises(TJMCommandError) as t:
-            bad_queue = JM.get_allocations()
+            bad_queue = jm.get_allocations()
 
 
-def test_list_files():
+def test_list_files(jm, remote_test_dir):
     """Test getting info on file and folders in remote directories"""
 
-    # Create a test file and folder and empty trash directory
-    JM.empty_trash()
-    test_fname, test_file, test_folder, = _setup_local_test_files()
-
-    # Upload directory with file in it
-    dest_name = 'test_dir'
-    dest_dir = '/'.join([JM.trash_dir, dest_name])
-    JM.upload(test_folder, dest_dir)
+    # Folder with test file in it, uploaded once for the test session
+    test_fname = 'test.txt'
+    dest_dir = remote_test_dir
 
     # Now get folder info of folder uploaded
-    files = JM.list_files(dest_dir)
+    files = jm.list_files(dest_dir)
     assert len(files)==1
     assert test_fname==files[0]['filename']
     assert 24==files[0]['st_size']
 
     # Now get info on file only in folder
     remote_file_path = '/'.join([dest_dir, test_fname])
-    file = JM.list_files(remote_file_path)
+    file = jm.list_files(remote_file_path)
     assert len(file)==1
     assert remote_file_path==file[0]['filename']
     assert 24==file[0]['st_size']
 
-    with patch.object(SSHClient2FA, 'open_sftp',
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=FileNotFoundError('Mock file not found error')):
         with pytest.raises(FileNotFoundError):
-            JM.list_files(dest_dir)
-    with patch.object(SSHClient2FA, 'open_sftp',
+            jm.list_files(dest_dir)
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=PermissionError('Mock file permission error')):
         with pytest.raises(PermissionError):
-            JM.list_files(dest_dir)
-    with patch.object(SSHClient2FA, 'open_sftp',
+            jm.list_files(dest_dir)
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=Exception('Mock unexpected error')):
         with pytest.raises(Exception):
-            JM.list_files(dest_dir)
-
-    # Cleanup local and remote files
-    JM.empty_trash()
-    _cleanup_local_test_files()
+            jm.list_files(dest_dir)
 
 
-def test_peak_file():
+def test_peak_file(jm, remote_test_dir):
     """Test peak_file operations"""
 
-    # Create a test file and folder
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
-
-    # Upload directory with file in it
-    dest_fname = 'test_path'
-    dest_path = '/'.join([JM.trash_dir, dest_fname])
-    JM.upload(test_file, dest_path)
+    # Test file in folder uploaded once for the test session
+    test_file = dest_path = posixpath.join(remote_test_dir, 'test.txt')
 
     # Now peak at first line in file
-    first_line = JM.peak_file(dest_path, head=1)
+    first_line = jm.peak_file(dest_path, head=1)
     assert first_line=='hello world\n'
 
     # Now peak at last line in file
-    last_line = JM.peak_file(dest_path, tail=1)
+    last_line = jm.peak_file(dest_path, tail=1)
     assert last_line=='hello again\n'
 
     # Now peak again at first line
-    both_lines = JM.peak_file(dest_path)
+    both_lines = jm.peak_file(dest_path)
     assert both_lines=='hello world\nhello again\n'
 
     # Mock permission, file not found, and unexpected peak file errors
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'head', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'head', 1,
                              'Permission denied',
                              '', 'Mock permission error')):
         with pytest.raises(PermissionError) as p:
-            JM.peak_file(test_file)
+            jm.peak_file(test_file)
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'head', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'head', 1,
                              'Not a directory', '', 'Mock file not found')):
         with pytest.raises(FileNotFoundError) as f:
-            JM.peak_file(test_file)
+            jm.peak_file(test_file)
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'head', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'head', 1,
                              'Unexpected error', '', 'Mock unexpected error')):
         with pytest.raises(TJMCommandError) as t:
-            JM.peak_file(test_file)
-
-    # Cleanup local and remote files
-    JM.empty_trash(dest_path)
-    _cleanup_local_test_files()
+            jm.peak_file(test_file)
 
 
-def test_upload():
+def test_upload(jm, local_test_files):
     """Test uploadng a file and folder"""
 
-    # Create a test file and folder and empty trash
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    # Empty trash
+    jm.empty_trash()
+    test_fname, test_file, test_folder = local_test_files
 
     # Send file - Try sending file only to trash directory
     dest_name = 'test_file'
-    dest_path = '/'.join([JM.trash_dir, dest_name])
-    JM.upload(test_file, dest_path)
-    files = JM.list_files(JM.trash_dir)
+    dest_path = '/'.join([jm.trash_dir, dest_name])
+    jm.upload(test_file, dest_path)
+    files = jm.list_files(jm.trash_dir)
     assert dest_name in [f['filename'] for f in files]
 
     # Send directory - Try sending directory now
     dest_name = 'test_dir'
-    dest_dir = '/'.join([JM.trash_dir, dest_name])
-    JM.upload(test_folder, dest_dir)
-    files = JM.list_files(JM.trash_dir)
+    dest_dir = '/'.join([jm.trash_dir, dest_name])
+    jm.upload(test_folder, dest_dir)
+    files = jm.list_files(jm.trash_dir)
     assert dest_name in [f['filename'] for f in files]
-    files = JM.list_files(dest_dir)
+    files = jm.list_files(dest_dir)
     assert test_fname in [f['filename'] for f in files]
 
     # Try sending a file that doesn't exist
     with pytest.raises(FileNotFoundError):
-        JM.upload('./does-not-exist', dest_path)
+        jm.upload('./does-not-exist', dest_path)
+
+    # Try sending a folder into a remote directory that doesn't exist
+    with pytest.raises(FileNotFoundError):
+        jm.upload(test_folder, '/'.join([jm.trash_dir, 'no/such/dir']))
+
+    # Mock tar not having permission to unpack in remote directory
+    with patch.object(TACCJobManager, '_execute_command',
+            side_effect=TJMCommandError(jm.system, jm.user, 'tar...', 2,
+                            'tar: test_dir: Cannot mkdir: Permission denied',
+                            '', 'mock tar error')):
+        with pytest.raises(PermissionError):
+            jm.upload(test_folder, dest_dir)
 
     # Now mock permission and untar-ing error, and unexpcted error
-    with patch.object(SSHClient2FA, 'open_sftp',
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=PermissionError('Mock file permission')):
         with pytest.raises(PermissionError):
-            JM.upload(test_folder, dest_dir)
-    with patch.object(SSHClient2FA, 'open_sftp',
+            jm.upload(test_file, dest_path)
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=Exception('Mock other error')):
         with pytest.raises(Exception):
-            JM.upload(test_file, dest_path)
+            jm.upload(test_file, dest_path)
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'tar...', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'tar...', 1,
                             'mock tar error', '', 'mock tar error')):
         with pytest.raises(TJMCommandError) as t:
-            JM.upload(test_folder, dest_dir)
+            jm.upload(test_folder, dest_dir)
 
-    # Remove test folder and file we sent and local test folder
-    JM.empty_trash()
-    _cleanup_local_test_files()
+    # Remove test folder and file we sent
+    jm.empty_trash()
 
-def test_download():
-    """Test downloading files/folders"""
+def test_compressible(tmp_path):
+    """Test choosing whether to gzip folders being uploaded"""
 
-    # Empty trash Create a test file and folder
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    # Local check only, no connection needed
+    compressible = TACCJobManager._compressible
+
+    # Folder mostly made up of already compressed files
+    folder = tmp_path / 'data'
+    (folder / 'sub').mkdir(parents=True)
+    (folder / 'sub' / 'a.gz').write_bytes(os.urandom(2**16))
+    (folder / 'b.txt').write_text('hello world\n' * 100)
+    assert not compressible(str(folder), 'data')
+
+    # Files excluded by filter are not counted, nor are excluded folders
+    assert compressible(str(folder), 'data', file_filter='*[!z]')
+    assert compressible(str(folder), 'data', file_filter='*[!b]')
+
+    # Mostly text files
+    (folder / 'c.txt').write_text('hello world\n' * 2**14)
+    assert compressible(str(folder), 'data')
+
+    # Empty folder
+    (tmp_path / 'empty').mkdir()
+    assert compressible(str(tmp_path / 'empty'), 'empty')
 
-    # Upload directory with file in it
-    dest_dirname = 'test_path'
-    dest_path = '/'.join([JM.trash_dir, dest_dirname])
-    JM.upload(test_folder, dest_path)
+
+def test_upload_uncompressed(jm, tmp_path):
+    """Test round trip of folder sent without gzip compression"""
+
+    # Folder made up of already compressed files -> Sent uncompressed
+    folder = tmp_path / 'data'
+    (folder / 'sub').mkdir(parents=True)
+    data = os.urandom(2**16)
+    (folder / 'sub' / 'a.gz').write_bytes(data)
+    (folder / 'b.txt').write_text('hello world\n')
+
+    jm.empty_trash()
+    dest_dir = '/'.join([jm.trash_dir, 'gz_dir'])
+    with patch.object(TACCJobManager, '_execute_command',
+            wraps=jm._execute_command) as ex:
+        jm.upload(str(folder), dest_dir)
+    assert ex.call_args.args[0].startswith('tar -xf - ')
+
+    # Download it back and compare contents
+    download_dir = tmp_path / 'download'
+    download_dir.mkdir()
+    jm.download(dest_dir, str(download_dir))
+    assert (download_dir / 'gz_dir' / 'sub' / 'a.gz').read_bytes()==data
+    assert (download_dir / 'gz_dir' / 'b.txt').read_text()=='hello world\n'
+
+    jm.empty_trash()
+
+
+def test_download(jm, remote_test_dir, local_test_files):
+    """Test downloading files/folders"""
+
+    # Local test file and folder, same contents as the remote test folder
+    test_fname, test_file, test_folder = local_test_files
+    dest_path = remote_test_dir
+    dest_dirname = posixpath.basename(remote_test_dir)
 
     # Now download file inside folder just uploaded
     remote_fpath = '/'.join([dest_path, test_fname])
     download_path = os.path.join(test_folder, 'test_downloaded.txt')
-    JM.download(remote_fpath, download_path)
+    jm.download(remote_fpath, download_path)
     with open(download_path, 'r') as f1, open(test_file, 'r') as f2:
         assert f1.read()==f2.read()
 
     # Now download full folder just uploaded
-    JM.download(dest_path, test_folder)
+    jm.download(dest_path, test_folder)
     assert dest_dirname in os.listdir(test_folder)
     downloaded_file = os.path.join(test_folder, dest_dirname, test_fname)
     with open(downloaded_file, 'r') as f1, open(test_file, 'r') as f2:
@@ -313,340 +386,454 @@ def test_download():
     # because tar does not exist on remote system.
     # Note: temporary tar file .test.tar.gz should be cleaned up here
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'tar...', 1,
-                            '', 'padding with zeros', 'mock tar error')):
+            side_effect=TJMCommandError(jm.system, jm.user, 'tar...', 1,
+                            'padding with zeros', '', 'mock tar error')):
         with pytest.raises(FileNotFoundError) as t:
-            JM.download(dest_path, test_folder)
+            jm.download(dest_path, test_folder)
             local_tar = f"{os.path.split(test_folder)[1]}.tar.gz."
             assert local_tar not in os.listdir('.')
 
 
     # Mock other critical tar error
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'tar...', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'tar...', 1,
                             'critical error', '', 'mock tar error')):
         with pytest.raises(TJMCommandError) as t:
-            JM.download(dest_path, test_folder)
+            jm.download(dest_path, test_folder)
 
     # Mock permission error
-    with patch.object(SSHClient2FA, 'open_sftp',
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=PermissionError('Mock file permission')):
         with pytest.raises(PermissionError):
-            JM.download(dest_path, test_folder)
+            jm.download(dest_path, test_folder)
 
-    # Empty trash dir and clean local files to conclude tests
-    JM.empty_trash()
-    _cleanup_local_test_files()
 
-
-def test_remove():
+def test_remove(jm, local_test_files):
     """Test removing files on remote system"""
 
     # Empty trash dir and create a test file and folder
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    jm.empty_trash()
+    test_fname, test_file, test_folder = local_test_files
 
     # Upload directory with file in it
     dest_dirname = 'test_path'
-    dest_path = '/'.join([JM.trash_dir, dest_dirname])
-    JM.upload(test_folder, dest_path)
+    dest_path = '/'.join([jm.trash_dir, dest_dirname])
+    jm.upload(test_folder, dest_path)
 
     # Now remove file inside directory
     remote_fname = posixpath.join(dest_path, test_fname)
     trash_name = remote_fname.replace('/','___')
-    JM.remove(remote_fname)
-    remote_dir_files = JM.list_files(dest_path)
-    trash_files = JM.list_files(JM.trash_dir)
+    jm.remove(remote_fname)
+    remote_dir_files = jm.list_files(dest_path)
+    trash_files = jm.list_files(jm.trash_dir)
     assert test_fname not in [f['filename'] for f in remote_dir_files]
     assert trash_name in [f['filename'] for f in trash_files]
 
     # Now remove whole directory
-    JM.remove(dest_path)
+    jm.remove(dest_path)
     trash_name = dest_path.replace('/','___')
-    trash_files = JM.list_files(JM.trash_dir)
+    trash_files = jm.list_files(jm.trash_dir)
     assert trash_name in [f['filename'] for f in trash_files]
 
     # Remove non-existant file
     with pytest.raises(FileNotFoundError) as t:
-        JM.remove('does-not-exist')
+        jm.remove('does-not-exist')
 
     # Upload and mock error back-ing up file in trash dir
-    JM.upload(test_folder, dest_path)
+    jm.upload(test_folder, dest_path)
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'rsync ...', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'rsync ...', 1,
                             'mock rsync error', '', 'mock error')):
         with pytest.raises(TJMCommandError) as t:
-            JM.remove(dest_path)
+            jm.remove(dest_path)
 
     # Delete file again (even though file exists already in trash)
     # Should be ok with this.
-    JM.remove(dest_path)
+    jm.remove(dest_path)
 
-    # Empty trash dir and clean local files to conclude tests
-    JM.empty_trash()
-    _cleanup_local_test_files()
+    # Empty trash dir to conclude tests
+    jm.empty_trash()
 
 
-def test_restore():
+def test_restore(jm, local_test_files):
     """Test restoring file"""
 
     # Empty trash dir and create a test file and folder
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    jm.empty_trash()
+    test_fname, test_file, test_folder = local_test_files
 
     # Upload directory with file in it
     dest_dirname = 'test_path'
-    dest_path = '/'.join([JM.trash_dir, dest_dirname])
-    JM.upload(test_folder, dest_path)
+    dest_path = '/'.join([jm.trash_dir, dest_dirname])
+    jm.upload(test_folder, dest_path)
 
     # Now remove file inside directory and restore it
     remote_fname = posixpath.join(dest_path, test_fname)
     trash_name = remote_fname.replace('/','___')
-    JM.remove(remote_fname)
-    JM.restore(remote_fname)
-    remote_dir_files = JM.list_files(dest_path)
-    trash_files = JM.list_files(JM.trash_dir)
+    jm.remove(remote_fname)
+    jm.restore(remote_fname)
+    remote_dir_files = jm.list_files(dest_path)
+    trash_files = jm.list_files(jm.trash_dir)
     assert test_fname in [f['filename'] for f in remote_dir_files]
     assert trash_name not in [f['filename'] for f in trash_files]
 
     # Restore non-existant file
     with pytest.raises(FileNotFoundError) as t:
-        JM.restore('does-not-exist')
+        jm.restore('does-not-exist')
 
     # Mock command error error restoring file. First remove folder again.
-    JM.remove(dest_path)
+    jm.remove(dest_path)
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'mv ...', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'mv ...', 1,
                             'mock mv error', '', 'mock error')):
         with pytest.raises(TJMCommandError) as t:
-            JM.restore(dest_path)
+            jm.restore(dest_path)
 
     # Now test restoring whole directory
-    JM.restore(dest_path)
+    jm.restore(dest_path)
     trash_name = dest_path.replace('/','___')
-    trash_files = JM.list_files(JM.trash_dir)
+    trash_files = jm.list_files(jm.trash_dir)
     assert test_fname in [f['filename'] for f in remote_dir_files]
     assert trash_name not in [f['filename'] for f in trash_files]
 
-    # Empty trash dir and clean local files to conclude tests
-    JM.empty_trash()
-    _cleanup_local_test_files()
+    # Empty trash dir to conclude tests
+    jm.empty_trash()
 
 
-def test_empty_trash():
+def test_empty_trash(jm, local_test_files):
     """Test emptying trash directory"""
 
     # Empty trash dir and create a test file and folder
-    JM.empty_trash()
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    jm.empty_trash()
+    test_fname, test_file, test_folder = local_test_files
 
     # Upload directory with file in it to trash directory
     dest_dirname = 'test_path'
-    dest_path = '/'.join([JM.trash_dir, dest_dirname])
-    JM.upload(test_folder, dest_path)
+    dest_path = '/'.join([jm.trash_dir, dest_dirname])
+    jm.upload(test_folder, dest_path)
 
     # Empty trash directory and assert nothing in it now
-    JM.empty_trash()
-    trash_files = JM.list_files(JM.trash_dir)
+    jm.empty_trash()
+    trash_files = jm.list_files(jm.trash_dir)
     assert len(trash_files)==0
 
-    # Empty trash dir and clean local files to conclude tests
-    JM.empty_trash()
-    _cleanup_local_test_files()
+    # Empty trash dir to conclude tests
+    jm.empty_trash()
 
 
-def test_write():
+def test_write(jm):
     """Test writing file directly"""
 
     # Empty trash dir
-    JM.empty_trash()
+    jm.empty_trash()
 
     # Write some text data to a file
-    txt_file = posixpath.join(JM.trash_dir, 'test.txt')
-    JM.write('hello world\n', txt_file)
-    trash_files = JM.list_files(JM.trash_dir)
+    txt_file = posixpath.join(jm.trash_dir, 'test.txt')
+    jm.write('hello world\n', txt_file)
+    trash_files = jm.list_files(jm.trash_dir)
     assert len(trash_files)==1
     assert trash_files[0]['filename']=='test.txt'
     assert trash_files[0]['st_size']==12
-    JM.empty_trash()
+    jm.empty_trash()
 
     # Write some json data to a file
-    json_file = posixpath.join(JM.trash_dir, 'test.json')
-    JM.write({'msg':'hello world'}, json_file)
-    trash_files = JM.list_files(JM.trash_dir)
+    json_file = posixpath.join(jm.trash_dir, 'test.json')
+    jm.write({'msg':'hello world'}, json_file)
+    trash_files = jm.list_files(jm.trash_dir)
     assert len(trash_files)==1
     assert trash_files[0]['filename']=='test.json'
     assert trash_files[0]['st_size']==22
-    JM.empty_trash()
+    jm.empty_trash()
 
     # Try to write wrong data type
     with pytest.raises(ValueError):
-        JM.write(['hello world'], json_file)
+        jm.write(['hello world'], json_file)
 
     # Mock not found, permission, and unexpected errors
-    with patch.object(SSHClient2FA, 'open_sftp',
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=FileNotFoundError('Mock file not found')):
         with pytest.raises(FileNotFoundError):
-            JM.write('hello world\n', txt_file)
-    with patch.object(SSHClient2FA, 'open_sftp',
+            jm.write('hello world\n', txt_file)
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=PermissionError('Mock permission error')):
         with pytest.raises(PermissionError):
-            JM.write('hello world\n', txt_file)
-    with patch.object(SSHClient2FA, 'open_sftp',
+            jm.write('hello world\n', txt_file)
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=Exception('Unexpected Error')):
         with pytest.raises(Exception):
-            JM.write('hello world\n', txt_file)
+            jm.write('hello world\n', txt_file)
 
-def test_read():
+def test_read(jm):
     """Test reading file directly"""
 
     # Empty trash dir
-    JM.empty_trash()
+    jm.empty_trash()
 
     txt = 'hello world\n'
     d = {'msg':'hello world'}
 
     # Write some text and json data to a files
-    txt_file = posixpath.join(JM.trash_dir, 'test.txt')
-    json_file = posixpath.join(JM.trash_dir, 'test.json')
-    JM.write(txt, txt_file)
-    JM.write(d, json_file)
+    txt_file = posixpath.join(jm.trash_dir, 'test.txt')
+    json_file = posixpath.join(jm.trash_dir, 'test.json')
+    jm.write(txt, txt_file)
+    jm.write(d, json_file)
 
     # Read data back in
-    txt_data = JM.read(txt_file, data_type='text')
-    json_data = JM.read(json_file, data_type='json')
+    txt_data = jm.read(txt_file, data_type='text')
+    json_data = jm.read(json_file, data_type='json')
     assert txt_data==txt
     assert json_data==d
 
+    # Read empty file
+    empty_file = posixpath.join(jm.trash_dir, 'empty.txt')
+    jm.write('', empty_file)
+    assert jm.read(empty_file, data_type='text')==''
+
     # Try to read not supported data type
     with pytest.raises(ValueError):
-        JM.read(txt_file, data_type='list')
+        jm.read(txt_file, data_type='list')
 
     # Mock not found, permission, and unexpected errors
-    with patch.object(SSHClient2FA, 'open_sftp',
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=FileNotFoundError('Mock file not found')):
         with pytest.raises(FileNotFoundError):
-            txt_data = JM.read(txt_file, data_type='text')
-    with patch.object(SSHClient2FA, 'open_sftp',
+            txt_data = jm.read(txt_file, data_type='text')
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=PermissionError('Mock permission error')):
         with pytest.raises(PermissionError):
-            txt_data = JM.read(txt_file, data_type='text')
-    with patch.object(SSHClient2FA, 'open_sftp',
+            txt_data = jm.read(txt_file, data_type='text')
+    with patch.object(TACCJobManager, '_open_sftp',
             side_effect=Exception('Unexpected Error')):
         with pytest.raises(Exception):
-            txt_data = JM.read(txt_file, data_type='text')
+            txt_data = jm.read(txt_file, data_type='text')
 
     # Empty trash dir to finish
-    JM.empty_trash()
+    jm.empty_trash()
+
+
+def test_load_json_file(tmp_path):
+    """Test loading and caching local json config files"""
+
+    path = str(tmp_path / 'app.json')
+    with open(path, 'w') as f:
+        json.dump({'name': 'test'}, f)
 
+    clear_json_cache()
+    with patch('taccjm.utils.json.load', wraps=json.load) as load:
+        # Second load of unchanged file should hit the cache
+        assert load_json_file(path)=={'name': 'test'}
+        assert load_json_file(path)=={'name': 'test'}
+        assert load.call_count==1
+
+        # Cached config is copied, so callers can modify what they get back
+        config = load_json_file(path)
+        config['name'] = 'modified'
+        assert load_json_file(path)=={'name': 'test'}
+        assert load.call_count==1
+
+        # Clearing cache forces a re-parse
+        clear_json_cache()
+        assert load_json_file(path)=={'name': 'test'}
+        assert load.call_count==2
+
+        # So does modifying the file
+        with open(path, 'w') as f:
+            json.dump({'name': 'test-2'}, f)
+        assert load_json_file(path)=={'name': 'test-2'}
+        assert load.call_count==3
+
+    # Error - Loading file that doesn't exist
+    with pytest.raises(FileNotFoundError):
+        load_json_file(str(tmp_path / 'does-not-exist.json'))
 
-def test_apps():
+
+def test_apps(jm):
     """Test getting and deploying applications"""
 
     # Name of test app directory locally
     test_app = '.test-app'
 
     # Remove all apps in apps dir remotely and remove app locally if exists
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    os.system(f"rm -rf {test_app}")
+    jm._execute_command(f"rm -rf {jm.apps_dir}/*")
+    shutil.rmtree(test_app, ignore_errors=True)
 
     # Create template app locally
     app_config = create_template_app(test_app)
 
     # Deploy app from files
-    app1 = JM.deploy_app(local_app_dir=test_app)
-    apps = JM.get_apps()
+    app1 = jm.deploy_app(local_app_dir=test_app)
+    apps = jm.get_apps()
     assert len(apps)==1
     assert apps[0]==app1['name']
 
     # Assert app assets, in this case its script, were uploaded
-    remote_app_dir = posixpath.join(JM.apps_dir, app1['name'])
-    app_files = JM.list_files(remote_app_dir)
+    remote_app_dir = posixpath.join(jm.apps_dir, app1['name'])
+    app_files = jm.list_files(remote_app_dir)
     assert 'run.sh' in [f['filename'] for f in app_files]
 
     # Ge app and assert its config matches what we got back from deploy
-    dep_app = JM.get_app(app1['name'])
+    dep_app = jm.get_app(app1['name'])
     assert dep_app==app1
 
     # Now get app that doesn exist
     with pytest.raises(ValueError):
-        bad_app = JM.get_app('bad-app')
+        bad_app = jm.get_app('bad-app')
 
     # Now deploy app from dictionary with same name but change node-count
     app1['default_node_count'] = 2*app1['default_node_count']
-    app1_up= JM.deploy_app(app_config=app1,
+    app1_up= jm.deploy_app(app_config=app1,
             local_app_dir=test_app, overwrite=True)
     assert app1_up['default_node_count']==2*dep_app['default_node_count']
 
+    # Cached config should have been refreshed by the redeploy
+    dep_app = jm.get_app(app1['name'])
+    assert dep_app['default_node_count']==app1_up['default_node_count']
+
     # error - overwrite not set
     with pytest.raises(ValueError):
-        app1_up= JM.deploy_app(app_config=app1)
+        app1_up= jm.deploy_app(app_config=app1)
 
-    # error - missing app config
-    with pytest.raises(ValueError):
-        app1.pop('entry_script')
-        app1_up= JM.deploy_app(app_config=app1)
+    # error - missing app config, caught before any remote calls
+    with patch.object(TACCJobManager, 'list_files') as ls, \
+         patch.object(TACCJobManager, '_execute_command') as ex:
+        with pytest.raises(ValueError):
+            app1.pop('entry_script')
+            app1_up= jm.deploy_app(app_config=app1)
+        ls.assert_not_called()
+        ex.assert_not_called()
 
     # Force error deploying application data
     with patch.object(TACCJobManager, 'upload',
             side_effect=Exception('Mock upload file error')):
         with pytest.raises(Exception) as e:
-            bad_app = JM.deploy_app(local_app_dir=test_app, name='bad_app')
+            bad_app = jm.deploy_app(local_app_dir=test_app, name='bad_app')
 
     # Clean app dir to conclude and remove local app
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    os.system(f"rm -rf {test_app}")
-
-
-def test_deploy_job():
+    jm._execute_command(f"rm -rf {jm.apps_dir}/*")
+    shutil.rmtree(test_app, ignore_errors=True)
+
+
+def test_apps_cache():
+    """Test caching list of deployed apps and their configs"""
+
+    # Bare job manager, not connected, with only what apps cache needs
+    jm = TACCJobManager.__new__(TACCJobManager)
+    jm.apps_dir = 'taccjm/apps'
+    jm._clear_apps_cache()
+
+    files = [{'filename': 'test-app'}, {'filename': '.hidden'}]
+    with patch.object(TACCJobManager, 'APPS_CACHE_TTL', 0.5), \
+         patch.object(TACCJobManager, 'list_files', return_value=files) as ls, \
+         patch.object(TACCJobManager, 'read', return_value={'name': 'test-app'}
+                      ) as read:
+        # Second call within TTL served from cache
+        assert jm.get_apps()==['test-app']
+        assert jm.get_apps()==['test-app']
+        assert ls.call_count==1
+
+        # As are app configs, copied so callers can modify them
+        config = jm.get_app('test-app')
+        config['name'] = 'modified'
+        assert jm.get_app('test-app')=={'name': 'test-app'}
+        read.assert_called_once_with('taccjm/apps/test-app/app.json',
+                                     data_type='json')
+        assert ls.call_count==1
+
+        # Once TTL expires, apps list and configs are fetched again
+        time.sleep(0.5)
+        assert jm.get_apps()==['test-app']
+        assert ls.call_count==2
+        assert jm.get_app('test-app')=={'name': 'test-app'}
+        assert read.call_count==2
+
+        # Clearing cache, as deploy_app does, forces a fetch within TTL
+        jm._clear_apps_cache()
+        assert jm.get_apps()==['test-app']
+        assert ls.call_count==3
+
+
+def test_deploy_job(jm, env):
     """Test setting up jobs"""
 
+    # TACC allocation, from tests .env file
+    allocation = env['ALLOCATION']
+
     # Name of test app directory locally
     test_app = '.test-app'
 
     # Remove all apps and jobs  in apps/jobs dir remotely
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
 
     # Remove app locally if exists
-    os.system(f"rm -rf {test_app}")
+    shutil.rmtree(test_app, ignore_errors=True)
 
     # Create template app locally
     app_config, job_config = create_template_app(test_app)
 
     # Deploy app from files
-    app1 = JM.deploy_app(local_app_dir=test_app)
+    app1 = jm.deploy_app(local_app_dir=test_app)
 
     # Setup a test job from the configs in default app directory, dont stage
-    job1 = JM.deploy_job(local_job_dir=test_app, stage=False)
+    job1 = jm.deploy_job(local_job_dir=test_app, stage=False)
     assert job1['app']==app_config['name']
 
     # Setup a test job from dictioanry just loaded, dont stage
-    job2 = JM.deploy_job(job_config=job1, local_job_dir=test_app, stage=False)
+    job2 = jm.deploy_job(job_config=job1, local_job_dir=test_app, stage=False)
     assert job2['app']==app_config['name']
 
     # Now create test input file and send with job and stage job
-    os.system(f"echo hello world > {job1['inputs']['input1']}")
-    job3 = JM.deploy_job(job_config=job1.copy(),
+    with open(job1['inputs']['input1'], 'w') as f:
+        f.write('hello world\n')
+    job3 = jm.deploy_job(job_config=job1.copy(),
             local_job_dir=test_app, stage=True)
-    jobs = JM.get_jobs()
+    jobs = jm.get_jobs()
     assert job3['job_id'] in jobs
-    staged_job = JM.get_job(job3['job_id'])
+    staged_job = jm.get_job(job3['job_id'])
     assert staged_job==job3
 
     # Setup another job with allocation and email
-    job4 = JM.deploy_job(job_config=job1.copy(),
+    job4 = jm.deploy_job(job_config=job1.copy(),
             local_job_dir=test_app, stage=True,
-            email='test@test.com', allocation=ALLOCATION)
-    jobs = JM.get_jobs()
+            email='test@test.com', allocation=allocation)
+    jobs = jm.get_jobs()
     assert job4['job_id'] in jobs
-    staged_job = JM.get_job(job4['job_id'])
+    staged_job = jm.get_job(job4['job_id'])
     assert staged_job==job4
     assert 'allocation' in job4.keys() and 'email' in job4.keys()
 
+    # A single input is sent inline, not through a pool of upload workers
+    with patch.object(TACCJobManager, '_upload_input') as upload_input:
+        job5 = jm.deploy_job(job_config=job1.copy(), name='single-input',
+                local_job_dir=test_app, stage=True)
+        upload_input.assert_not_called()
+    assert 'single-input' in job5['job_id']
+
+    # Several inputs are sent in parallel, all end up in inputs directory
+    input2 = os.path.join(test_app, 'input2.txt')
+    with open(input2, 'w') as f:
+        f.write('hello again\n')
+    multi = job1.copy()
+    multi['inputs'] = {'input1': job1['inputs']['input1'], 'input2': input2}
+    job6 = jm.deploy_job(job_config=multi, name='multi-input',
+            local_job_dir=test_app, stage=True)
+    files = [f['filename'] for f in jm.ls_job(job6['job_id'], 'inputs')]
+    assert all([os.path.basename(i) in files
+                for i in job6['inputs'].values()])
+
+    # Error - One of several inputs fails, job directory is cleaned up
+    jobs = jm.get_jobs()
+    bad_multi = job1.copy()
+    bad_multi['inputs'] = {'input1': job1['inputs']['input1'],
+                           'input2': 'does-not-exist'}
+    with pytest.raises(FileNotFoundError):
+        _ = jm.deploy_job(job_config=bad_multi, name='bad-multi-input',
+                local_job_dir=test_app, stage=True)
+    assert sorted(jm.get_jobs())==sorted(jobs)
+
     # Error - Getting job that doesn't exist
     with pytest.raises(ValueError):
-        _ = JM.get_job('does_not_exist')
+        _ = jm.get_job('does_not_exist')
 
     # Error - Setting up jobs with missing params/inputs
     no_inputs = job1.copy()
@@ -654,219 +841,253 @@ def test_deploy_job():
     no_params = job1.copy()
     no_params['parameters'] = {}
     with pytest.raises(ValueError):
-        _ = JM.deploy_job(job_config=no_inputs, local_job_dir=test_app, stage=True)
+        _ = jm.deploy_job(job_config=no_inputs, local_job_dir=test_app, stage=True)
     with pytest.raises(ValueError):
-        _ = JM.deploy_job(job_config=no_params, local_job_dir=test_app, stage=True)
+        _ = jm.deploy_job(job_config=no_params, local_job_dir=test_app, stage=True)
 
     # Error - Staging submit script
     with patch.object(TACCJobManager, '_parse_submit_script',
             side_effect=Exception('Mock parse submit script exception')):
         with pytest.raises(Exception):
-            _ = JM.deploy_job(local_job_dir=test_app, stage=True)
+            _ = jm.deploy_job(local_job_dir=test_app, stage=True)
 
     # Error - Failing to stage input
     with patch.object(TACCJobManager, 'upload',
             side_effect=Exception('Mock upload error')):
         with pytest.raises(Exception):
-            _ = JM.deploy_job(local_job_dir=test_app, stage=True)
+            _ = jm.deploy_job(local_job_dir=test_app, stage=True)
+
+    # Error - Failing to re-stage input of an existing job keeps its job dir
+    with patch.object(TACCJobManager, 'upload',
+            side_effect=Exception('Mock upload error')):
+        with pytest.raises(Exception):
+            _ = jm.deploy_job(job_config=job3.copy(),
+                    local_job_dir=test_app, stage=True)
+    assert job3['job_id'] in jm.get_jobs()
+    assert jm.get_job(job3['job_id'])==job3
 
     # Error - Failing to stage app contents (delete job dir)
-    _ = JM.remove_job(job3['job_id'])
+    _ = jm.remove_job(job3['job_id'])
     with pytest.raises(TJMCommandError):
-        _ = JM.deploy_job(job_config=job3,
+        _ = jm.deploy_job(job_config=job3,
                 local_job_dir=test_app, stage=True)
 
     # cleanup
     os.remove(f"{job1['inputs']['input1']}")
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
-    os.system(f"rm -rf {test_app}")
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
+    shutil.rmtree(test_app, ignore_errors=True)
 
 
-def test_run_job():
+def test_run_job(jm, env):
     """Test submitting, canceling, and removing/restoring jobs"""
 
+    # TACC allocation, from tests .env file
+    allocation = env['ALLOCATION']
+
     # Name of test app directory locally
     test_app = '.test-app'
 
     # Remove all apps and jobs  in apps/jobs dir remotely
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
 
     # Remove app locally if exists
-    os.system(f"rm -rf {test_app}")
+    shutil.rmtree(test_app, ignore_errors=True)
 
     # Create template app locally
     app_config, job_config = create_template_app(test_app)
 
     # Deploy app from files
-    app = JM.deploy_app(local_app_dir=test_app)
+    app = jm.deploy_app(local_app_dir=test_app)
 
     # Now create test input file and send with job and stage job
-    os.system(f"echo hello world > {job_config['inputs']['input1']}")
-    job = JM.deploy_job(local_job_dir=test_app, stage=True,
-            email='test@test.com', allocation=ALLOCATION)
+    with open(job_config['inputs']['input1'], 'w') as f:
+        f.write('hello world\n')
+    job = jm.deploy_job(local_job_dir=test_app, stage=True,
+            email='test@test.com', allocation=allocation)
 
     # Error - submit job but mock slurm queue error (FAILED on last line)
     with patch.object(TACCJobManager, '_execute_command',
             return_value='\nFAILED\n'):
         with pytest.raises(TJMCommandError):
-            _ = JM.submit_job(job['job_id'])
+            _ = jm.submit_job(job['job_id'])
 
     # Now submit job
-    job = JM.submit_job(job['job_id'])
+    job = jm.submit_job(job['job_id'])
     assert 'slurm_id' in job.keys()
     time.sleep(1)
-    assert job['slurm_id'] in [j['job_id'] for j in JM.showq()]
+    assert job['slurm_id'] in [j['job_id'] for j in jm.showq()]
 
     # Error - Try submitting again
     with pytest.raises(ValueError):
-        _ = JM.submit_job(job['job_id'])
+        _ = jm.submit_job(job['job_id'])
 
     # Error - Cancel job while running, but mock slurm error
     with patch.object(TACCJobManager, '_execute_command',
-            side_effect=TJMCommandError(SYSTEM, USER, 'scancel', 1,
+            side_effect=TJMCommandError(jm.system, jm.user, 'scancel', 1,
                             'mock scancel error', '', 'mock scancel error')):
         with pytest.raises(TJMCommandError):
-            _ = JM.cancel_job(job['job_id'])
+            _ = jm.cancel_job(job['job_id'])
 
     # Now cancel job for real
     old_id = job['slurm_id']
-    job = JM.cancel_job(job['job_id'])
+    job = jm.cancel_job(job['job_id'])
     assert 'slurm_id' not in job.keys()
     assert 'slurm_hist' in job.keys()
     assert old_id in job['slurm_hist']
 
-    # Try to cancel job again, will fail
-    with pytest.raises(ValueError):
-        _ = JM.cancel_job(job['job_id'])
+    # Try to cancel job again, will fail without trying scancel (mocked)
+    with patch.object(TACCJobManager, 'get_job', return_value=job), \
+         patch.object(TACCJobManager, '_execute_command') as ex:
+        with pytest.raises(ValueError):
+            _ = jm.cancel_job(job['job_id'])
+        ex.assert_not_called()
 
     # Submit job again, wait and then remove and restore job
-    job = JM.submit_job(job['job_id'])
+    job = jm.submit_job(job['job_id'])
     slurm_id = job['slurm_id']
     time.sleep(1)
-    rem_id = JM.remove_job(job['job_id'])
-    assert [rem_id not in JM.get_jobs()]
-    restored = JM.restore_job(rem_id)
-    assert [restored['job_id'] in JM.get_jobs()]
+    rem_id = jm.remove_job(job['job_id'])
+    assert [rem_id not in jm.get_jobs()]
+    restored = jm.restore_job(rem_id)
+    assert [restored['job_id'] in jm.get_jobs()]
     assert slurm_id in restored['slurm_hist']
 
     # Now try to remove a non-existant job, will not throw any error
-    _ = JM.remove_job('foo')
+    _ = jm.remove_job('foo')
 
     # Try to restore invalid job, will throw error
     with pytest.raises(ValueError):
-        _ = JM.restore_job('foo')
+        _ = jm.restore_job('foo')
 
     # cleanup
     os.remove(f"{job_config['inputs']['input1']}")
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
-    os.system(f"rm -rf {test_app}")
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
+    shutil.rmtree(test_app, ignore_errors=True)
 
-def test_job_files():
+def test_job_files(jm, env, local_test_files):
     """Test job file operations"""
 
+    # TACC allocation, from tests .env file
+    allocation = env['ALLOCATION']
+
     # Set up test files
-    test_fname, test_file, test_folder = _setup_local_test_files()
+    test_fname, test_file, test_folder = local_test_files
 
     # Name of test app directory locally
     test_app = '.test-app'
 
     # Remove all apps and jobs  in apps/jobs dir remotely
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
 
     # Remove app locally if exists
-    os.system(f"rm -rf {test_app}")
+    shutil.rmtree(test_app, ignore_errors=True)
 
     # Create template app locally
     app_config, job_config = create_template_app(test_app)
 
     # Deploy app from files
-    app = JM.deploy_app(local_app_dir=test_app)
+    app = jm.deploy_app(local_app_dir=test_app)
 
     # Now create test input file and send with job and stage job
-    os.system(f"echo hello world > {job_config['inputs']['input1']}")
-    job = JM.deploy_job(local_job_dir=test_app, stage=True,
-            email='test@test.com', allocation=ALLOCATION)
+    with open(job_config['inputs']['input1'], 'w') as f:
+        f.write('hello world\n')
+    job = jm.deploy_job(local_job_dir=test_app, stage=True,
+            email='test@test.com', allocation=allocation)
+
+    # Independent read-only probes of the staged job, run concurrently. Each
+    # thread gets its own SFTP session on the shared connection.
+    job_id = job['job_id']
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        f_jobs = ex.submit(jm.get_jobs)
+        f_job = ex.submit(jm.get_job, job_id)
+        f_ls = ex.submit(jm.ls_job, job_id)
+        f_inputs = ex.submit(jm.ls_job, f"{job_id}/inputs")
+        f_app = ex.submit(jm.ls_job, f"{job_id}/{app['name']}")
+        f_submit = ex.submit(jm.peak_job_file, job_id,
+                             'submit_script.sh', head=1)
+
+    # Job should be listed, and its config match the one from deploy
+    assert job_id in f_jobs.result()
+    assert f_job.result()==job
 
     # List job files - Structure should have job config, submit script, and
     # folders for app contents and inputs in folders
-    files = [f['filename'] for f in JM.ls_job(job['job_id'])]
+    files = [f['filename'] for f in f_ls.result()]
     job_files = ['job.json', 'submit_script.sh', app['name'], 'inputs']
     assert all([j in files for j in job_files])
 
     # Assert inputs in input directory
-    files = [f['filename'] for f in JM.ls_job(f"{job['job_id']}/inputs")]
+    files = [f['filename'] for f in f_inputs.result()]
     input_file = os.path.basename(job['inputs']['input1'])
     assert input_file in files
 
     # Assert app entry script in job directory
-    files = [f['filename'] for f in JM.ls_job(f"{job['job_id']}/{app['name']}")]
+    files = [f['filename'] for f in f_app.result()]
     assert app['entry_script'] in files
 
     # Peak at submit script
-    submit_script = JM.peak_job_file(job['job_id'], 'submit_script.sh', head=1)
-    assert submit_script=='#!/bin/bash\n'
+    assert f_submit.result()=='#!/bin/bash\n'
 
     # Error - peak at non-existant file
     with pytest.raises(FileNotFoundError):
-        JM.peak_job_file(job['job_id'], 'foo', head=1)
+        jm.peak_job_file(job['job_id'], 'foo', head=1)
 
     # Upload test folder to job directory
     folder_name = os.path.basename(test_folder)
-    JM.upload_job_file(job['job_id'], test_folder)
-    assert folder_name in [f['filename'] for f in JM.ls_job(job['job_id'])]
-    folder_contents = JM.ls_job(job['job_id'], path=folder_name)
+    jm.upload_job_file(job['job_id'], test_folder)
+    assert folder_name in [f['filename'] for f in jm.ls_job(job['job_id'])]
+    folder_contents = jm.ls_job(job['job_id'], path=folder_name)
     assert test_fname in [f['filename'] for f in folder_contents]
 
     # Now download job folder we just uploaded
-    download_path = JM.download_job_file(job['job_id'], folder_name,
+    download_path = jm.download_job_file(job['job_id'], folder_name,
             dest_dir=test_folder)
     assert job['job_id'] in os.listdir(test_folder)
     assert folder_name in os.listdir(os.path.join(test_folder, job['job_id']))
 
     # Error - Upload non-existant folder
     with pytest.raises(FileNotFoundError):
-        JM.upload_job_file(job['job_id'], 'does-not-exist')
+        jm.upload_job_file(job['job_id'], 'does-not-exist')
 
     # Error - download non-existant folder
     with pytest.raises(FileNotFoundError):
-        _ = JM.download_job_file(job['job_id'], 'foo', dest_dir=test_folder)
+        _ = jm.download_job_file(job['job_id'], 'foo', dest_dir=test_folder)
 
     # Write file to job directory
-    JM.write_job_file(job['job_id'], 'hello there\n', 'hi.txt')
-    assert 'hi.txt' in [f['filename'] for f in JM.ls_job(job['job_id'])]
-    text = JM.read_job_file(job['job_id'], 'hi.txt')
+    jm.write_job_file(job['job_id'], 'hello there\n', 'hi.txt')
+    assert 'hi.txt' in [f['filename'] for f in jm.ls_job(job['job_id'])]
+    text = jm.read_job_file(job['job_id'], 'hi.txt')
     assert text=='hello there\n'
 
     # Overwrite file
-    JM.write_job_file(job['job_id'], 'hello again\n', 'hi.txt')
-    text = JM.read_job_file(job['job_id'], 'hi.txt')
+    jm.write_job_file(job['job_id'], 'hello again\n', 'hi.txt')
+    text = jm.read_job_file(job['job_id'], 'hi.txt')
     assert text=='hello again\n'
 
     # Error - Write bad data to job directory
     with pytest.raises(ValueError):
-        JM.write_job_file(job['job_id'], ['hello there\n'], 'hi.txt')
+        jm.write_job_file(job['job_id'], ['hello there\n'], 'hi.txt')
 
     # Error - Read bad data to job directory
     with pytest.raises(ValueError):
-        JM.read_job_file(job['job_id'], 'hi.txt', data_type='bad')
+        jm.read_job_file(job['job_id'], 'hi.txt', data_type='bad')
 
     # Cleanup
-    JM._execute_command(f"rm -rf {JM.apps_dir}/*")
-    JM._execute_command(f"rm -rf {JM.jobs_dir}/*")
-    os.system(f"rm -rf {test_app}")
-    _cleanup_local_test_files()
+    jm._execute_commands([f"rm -rf {jm.apps_dir}/*",
+                          f"rm -rf {jm.jobs_dir}/*"])
+    shutil.rmtree(test_app, ignore_errors=True)
 
 
-def test_scripts():
+def test_scripts(jm, local_test_files):
     """Test deploying and running scripts."""
 
     # Create test bash and python scripts
-    test_fname, test_file, test_folder = _setup_local_test_files()
-    JM._execute_command(f"rm -rf {JM.scripts_dir}/*")
+    test_fname, test_file, test_folder = local_test_files
+    jm._execute_command(f"rm -rf {jm.scripts_dir}/*")
 
     py_script = os.path.join(test_folder, 'test-py.py')
     shell_script = os.path.join(test_folder, 'test-bash')
@@ -876,31 +1097,27 @@ def test_scripts():
         f.write('#!/bin/bash\necho $1\n')
 
     # Remove any existing scripts
-    JM._execute_command(f"rm -rf {JM.scripts_dir}/*")
+    jm._execute_command(f"rm -rf {jm.scripts_dir}/*")
 
     # Upload both scripts
-    JM.deploy_script(py_script)
-    JM.deploy_script(shell_script)
+    jm.deploy_script(py_script)
+    jm.deploy_script(shell_script)
 
     # Check scripts exist now
-    scripts = JM.list_scripts()
+    scripts = jm.list_scripts()
     assert 'test-py' in scripts
     assert 'test-bash' in scripts
 
     # Run both scripts and get outputs
-    out_1 = JM.run_script('test-py')
-    out_2 = JM.run_script('test-bash', args=['foo'])
+    out_1 = jm.run_script('test-py')
+    out_2 = jm.run_script('test-bash', args=['foo'])
     assert out_1=='hello world\n'
     assert out_2=='foo\n'
 
     # Value error - Deploy non existant script
     with pytest.raises(ValueError):
-        JM.deploy_script('does-not-exist')
+        jm.deploy_script('does-not-exist')
 
     # Cleanup
-    JM._execute_command(f"rm -rf {JM.scripts_dir}/*")
-    _cleanup_local_test_files()
-
+    jm._execute_command(f"rm -rf {jm.scripts_dir}/*")
 
-# Initialize JM for tests -> will ask for mfa input
-_init_TACCJobManager_tests()
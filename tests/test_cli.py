@@ -44,6 +44,10 @@ TEST_JM_ID = 'test-taccjm'
 # TEST JM  to use throughout tests
 TEST_JM = None
 
+# Shares the test server port and 'test-taccjm' remote working directory with
+# other test modules, so can't run in parallel with them
+pytestmark = pytest.mark.serial
+
 def_test_dir = Path(__file__).parent / ".test_dir"
 
 @pytest.fixture()
@@ -43,11 +43,16 @@ TEST_JM_ID = 'test-taccjm'
 # TEST JM  to use throughout tests
 TEST_JM = None
 
+# Shares the test server port and 'test-taccjm' remote working directory with
+# other test modules, so can't run in parallel with them
+pytestmark = pytest.mark.serial
 
-def _init_client():
+
+@pytest.fixture(scope="module", autouse=True)
+def init_client(mfa):
     """
-    Initializes TEST_JM on server. Note if server not found, not server will
-    be started if not found.
+    Initializes TEST_JM on server, before any test in this module runs. Note
+    if server not found, not server will be started if not found.
 
     """
 
@@ -59,8 +64,6 @@ def _init_client():
         # Kill test server
         tc.find_tjm_processes(kill=True)
 
-        # Get input to initialize
-        mfa = input('\nTACC Token:')
         TEST_JM = tc.init_jm(TEST_JM_ID, SYSTEM, USER, PW, mfa)
 
 
@@ -544,5 +547,3 @@ def test_scripts():
     # Cleanup local app dir
     os.system(f"rm -rf {py_script}")
 
-
-_init_client()
@@ -6,6 +6,7 @@ Integration tests for taccjm_server
 import os
 import pdb
 import hug
+import pytest
 from dotenv import load_dotenv
 from unittest.mock import patch
 
@@ -35,19 +36,13 @@ ALLOCATION = os.environ.get("TACCJM_ALLOCATION")
 # JM we will use for testing, only initailize once
 test_jm = f"test_{SYSTEM}"
 
-# Global Initialized Flag - Marks if JM has been initailized for any test
-initialized = False
 
-
-def _init_server():
-    """Call once to initailize JM for tests"""
-    global initialized
-    if not initialized:
-        mfa = input("\nTACC Token:")
-        init_args = {'jm_id': test_jm, 'system': SYSTEM,
-                     'user': USER, 'psw': PW, 'mfa':mfa}
-        response = hug.test.post(taccjm_server, 'init', init_args)
-        initialized = True
+@pytest.fixture(scope="module", autouse=True)
+def init_server(mfa):
+    """Initialize JM on server once, before any test in this module runs"""
+    init_args = {'jm_id': test_jm, 'system': SYSTEM,
+                 'user': USER, 'psw': PW, 'mfa':mfa}
+    response = hug.test.post(taccjm_server, 'init', init_args)
 
 
 def test_jms():
@@ -469,6 +464,3 @@ def test_scripts():
     os.remove(py_script)
 
 
-# Initialize JM for server tests
-_init_server()
-
@@ -0,0 +1,50 @@
+"""
+Tests for taccjm heartbeat script
+
+
+"""
+import time
+import asyncio
+import logging
+import pytest
+from unittest.mock import patch
+
+from taccjm import taccjm_server_heartbeat as hb
+
+__author__ = "Carlos del-Castillo-Negrete"
+__copyright__ = "Carlos del-Castillo-Negrete"
+__license__ = "MIT"
+
+
+def test_heartbeat_loop():
+    """Test heartbeat loop makes calls off the event loop until cancelled"""
+
+    def slow_list_jms():
+        # Blocking call, like the HTTP request made to the taccjm server
+        time.sleep(0.1)
+        return []
+
+    async def run_loop():
+        loop = asyncio.create_task(hb.heartbeat_loop(0.01))
+
+        # Event loop should not be held up by blocking heartbeat calls
+        start = time.monotonic()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+        elapsed = time.monotonic() - start
+
+        loop.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop
+        return elapsed
+
+    with patch.object(hb, '_logger', logging.getLogger(__name__)), \
+         patch.object(hb.tc, 'list_jms', side_effect=slow_list_jms) as ls, \
+         patch.object(hb, 'num_calls', 0):
+        elapsed = asyncio.run(run_loop())
+        assert elapsed<1.0
+
+        # Several heartbeats made, and their times recorded
+        assert ls.call_count>=2
+        assert hb.num_calls>=2
+        assert (hb.stats[:2]>=0.1).all()